@@ -3,31 +3,71 @@ EthioScan Crawler - Async web crawler for discovering pages, forms, and paramete
 """
 
 import asyncio
+import multiprocessing
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
+from functools import lru_cache
 from typing import Dict, List, Set, Tuple, Optional
-from urllib.parse import urljoin, urlparse, parse_qs, unquote
+from urllib.parse import urljoin, urlparse, unquote
 from urllib.robotparser import RobotFileParser
 import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 from rich.console import Console
 
+try:
+    from lxml import etree as lxml_etree
+    from lxml import html as lxml_html
+except ImportError:  # optional, C-based HTML parsing
+    lxml_html = None
+
 console = Console()
 
+# Link prefixes rejected by normalize_url without parsing ("javascript:",
+# the longest, is 11 characters)
+_REJECTED_SCHEME_PREFIXES = (
+    'mailto:', 'tel:', 'javascript:', 'data:', 'ftp:',
+    'about:', 'file:', 'ws:', 'wss:'
+)
+
+# Pages in one crawl level before parsing moves to worker processes; for
+# fewer pages, pool startup and pickling cost more than they save
+PARSE_POOL_MIN_PAGES = 4
+
+# Created lazily by _get_parse_pool
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
 
 class Crawler:
     """Async web crawler for EthioScan"""
     
-    def __init__(self, concurrency: int = 5, delay: float = 0.2, timeout: int = 10):
+    def __init__(self, concurrency: int = 5, delay: float = 0.2, timeout: int = 10,
+                 session: Optional[aiohttp.ClientSession] = None):
         self.concurrency = concurrency
         self.delay = delay
         self.timeout = timeout
         self.semaphore = asyncio.Semaphore(concurrency)
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional[aiohttp.ClientSession] = session
+        # A session passed in belongs to the caller and is left open on exit
+        self._owns_session = session is None
         
     async def __aenter__(self):
         """Async context manager entry"""
-        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        if not self._owns_session:
+            return self
+        
+        # One pooled connector for the whole crawl: keep-alive connections
+        # and cached DNS lookups are reused across pages
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=min(self.concurrency, 20),
+            keepalive_timeout=30,
+            ttl_dns_cache=300
+        )
         timeout = aiohttp.ClientTimeout(total=self.timeout)
         self.session = aiohttp.ClientSession(
             connector=connector,
@@ -40,10 +80,34 @@ class Crawler:
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
+        # Parse workers only serve a crawl; release them when it ends
+        _shutdown_parse_pool(wait=True)
+        
+        if self.session and self._owns_session:
             await self.session.close()
+    
+    async def fetch(self, url: str, retries: int = 2) -> Tuple[int, str, str]:
+        """
+        Fetch a page, holding a semaphore slot for the duration.
+        
+        Args:
+            url: URL to fetch
+            retries: Number of retries on failure
+            
+        Returns:
+            Tuple of (status_code, content, final_url)
+        """
+        async with self.semaphore:
+            result = await fetch_page(self.session, url, retries)
+            # Polite delay, taken before the slot is released
+            await asyncio.sleep(self.delay)
+            return result
 
 
+# base_url is the page being parsed, so cache hits come from links that
+# repeat within one page (header and footer menus, pagination, per-item
+# links), not from the same link seen again on other pages
+@lru_cache(maxsize=16384)
 def normalize_url(url: str, base_url: str) -> Optional[str]:
     """
     Normalize a URL to absolute form.
@@ -59,6 +123,10 @@ def normalize_url(url: str, base_url: str) -> Optional[str]:
         # Handle empty or None URLs
         if not url or url.strip() == '':
             return None
+        
+        # Common non-HTTP links are rejected by prefix, before any parsing
+        if url.lstrip()[:11].lower().startswith(_REJECTED_SCHEME_PREFIXES):
+            return None
             
         # Skip non-HTTP schemes
         parsed = urlparse(url)
@@ -69,9 +137,11 @@ def normalize_url(url: str, base_url: str) -> Optional[str]:
         if parsed.scheme in ['mailto', 'tel', 'javascript', 'data', 'ftp']:
             return None
             
-        # Make absolute URL
-        absolute_url = urljoin(base_url, url)
-        parsed_absolute = urlparse(absolute_url)
+        # Make absolute URL; an already-absolute link needs no join or reparse
+        if parsed.scheme and parsed.netloc:
+            parsed_absolute = parsed
+        else:
+            parsed_absolute = urlparse(urljoin(base_url, url))
         
         # Ensure we have a valid scheme and netloc
         if not parsed_absolute.scheme or not parsed_absolute.netloc:
@@ -98,12 +168,23 @@ def extract_query_params(url: str) -> List[str]:
     Returns:
         List of parameter names
     """
+    # Only the names are needed, so split the query string directly rather
+    # than building urlparse/parse_qs results. Mirrors parse_qs: pairs
+    # without a value are skipped, names are decoded and deduplicated
     try:
-        parsed = urlparse(url)
-        if parsed.query:
-            params = parse_qs(parsed.query)
-            return list(params.keys())
-        return []
+        query = url.partition('#')[0].partition('?')[2]
+        if not query:
+            return []
+        
+        names = {}
+        for pair in query.split('&'):
+            name, sep, value = pair.partition('=')
+            if not value:
+                continue
+            if '%' in name or '+' in name:
+                name = unquote(name.replace('+', ' '))
+            names[name] = None
+        return list(names)
     except Exception:
         return []
 
@@ -136,6 +217,50 @@ async def fetch_page(session: aiohttp.ClientSession, url: str, retries: int = 2)
                 return 0, "", url
 
 
+def _extract_elements(html: str) -> Tuple[List[str], List[Tuple[str, str, List[str]]]]:
+    """
+    Pull link targets and form details out of an HTML document.
+    
+    Uses lxml when installed, falling back to BeautifulSoup for documents
+    lxml rejects (empty input, str with an XML encoding declaration).
+    
+    Args:
+        html: HTML content
+        
+    Returns:
+        Tuple of (hrefs_list, forms_list of (action, method, input_names))
+    """
+    if lxml_html is not None:
+        try:
+            doc = lxml_html.document_fromstring(html)
+        except (ValueError, lxml_etree.ParserError):
+            doc = None
+        
+        if doc is not None:
+            hrefs = [href for href in (a.get('href') for a in doc.iter('a')) if href is not None]
+            forms = [
+                (
+                    form.get('action', ''),
+                    form.get('method', 'get'),
+                    [name for name in (inp.get('name') for inp in form.iter('input', 'textarea', 'select')) if name]
+                )
+                for form in doc.iter('form')
+            ]
+            return hrefs, forms
+    
+    soup = BeautifulSoup(html, 'html.parser')
+    hrefs = [a_tag['href'] for a_tag in soup.find_all('a', href=True)]
+    forms = [
+        (
+            form.get('action', ''),
+            form.get('method', 'get'),
+            [name for name in (inp.get('name') for inp in form.find_all(['input', 'textarea', 'select'])) if name]
+        )
+        for form in soup.find_all('form')
+    ]
+    return hrefs, forms
+
+
 def parse_html(html: str, base_url: str) -> Tuple[Set[str], List[Dict], List[Dict]]:
     """
     Parse HTML content to extract links, forms, and parameters.
@@ -147,14 +272,14 @@ def parse_html(html: str, base_url: str) -> Tuple[Set[str], List[Dict], List[Dic
     Returns:
         Tuple of (links_set, forms_list, params_list)
     """
-    soup = BeautifulSoup(html, 'html.parser')
+    hrefs, form_elements = _extract_elements(html)
     links = set()
     forms = []
     params = []
     
     # Extract links
-    for a_tag in soup.find_all('a', href=True):
-        normalized_url = normalize_url(a_tag['href'], base_url)
+    for href in hrefs:
+        normalized_url = normalize_url(href, base_url)
         if normalized_url:
             links.add(normalized_url)
             # Extract query parameters
@@ -166,31 +291,107 @@ def parse_html(html: str, base_url: str) -> Tuple[Set[str], List[Dict], List[Dic
                 })
     
     # Extract forms
-    for form in soup.find_all('form'):
-        action = form.get('action', '')
-        method = form.get('method', 'get').lower()
-        
+    for action, method, inputs in form_elements:
         # Normalize action URL
         action_url = urljoin(base_url, action) if action else base_url
         
-        # Extract input names
-        inputs = []
-        for inp in form.find_all(['input', 'textarea', 'select']):
-            name = inp.get('name')
-            if name:
-                inputs.append(name)
-        
         forms.append({
             'url': base_url,
             'action': action_url,
-            'method': method,
+            'method': method.lower(),
             'inputs': inputs
         })
     
     return links, forms, params
 
 
-async def crawl(start_url: str, depth: int = 2, concurrency: int = 5, delay: float = 0.2) -> Dict:
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """
+    Get the worker pool used for HTML parsing, creating it on first use.
+    
+    Returns:
+        Shared ProcessPoolExecutor
+    """
+    global _parse_pool
+    if _parse_pool is None:
+        # Workers are spawned rather than forked: the crawl runs alongside
+        # aiohttp's resolver threads, whose locks a fork could copy mid-use
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _parse_pool
+
+
+def _shutdown_parse_pool(wait: bool = False) -> None:
+    """
+    Shut down the parse pool, if any, so the next use starts a fresh one.
+    
+    Args:
+        wait: Wait for worker processes to exit (False when discarding a
+            broken pool mid-crawl)
+    """
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=wait, cancel_futures=True)
+        _parse_pool = None
+
+
+def _parse_inline(html: str, url: str):
+    """
+    Parse one page in this process.
+    
+    Args:
+        html: Page HTML
+        url: Final page URL
+        
+    Returns:
+        parse_html result tuple, or the exception raised
+    """
+    try:
+        return parse_html(html, url)
+    except Exception as e:
+        return e
+
+
+async def _parse_pages(pages: List[Tuple[str, str]]) -> List:
+    """
+    Parse several fetched pages, in worker processes when there are enough.
+    
+    Pages lost to a crashed worker are parsed inline, and the broken pool
+    is replaced on next use.
+    
+    Args:
+        pages: List of (html, final_url) tuples
+        
+    Returns:
+        List aligned with pages: parse_html result tuple, or the exception raised
+    """
+    if len(pages) >= PARSE_POOL_MIN_PAGES:
+        loop = asyncio.get_running_loop()
+        try:
+            pool = _get_parse_pool()
+            results = await asyncio.gather(
+                *(loop.run_in_executor(pool, parse_html, html, url) for html, url in pages),
+                return_exceptions=True
+            )
+        except (OSError, BrokenProcessPool) as e:
+            console.print(f"[yellow]Parse pool unavailable, parsing inline: {e}[/yellow]")
+            _shutdown_parse_pool()
+        else:
+            broken = [i for i, result in enumerate(results) if isinstance(result, BrokenProcessPool)]
+            if broken:
+                console.print(f"[yellow]Parse worker crashed, re-parsing {len(broken)} pages inline[/yellow]")
+                _shutdown_parse_pool()
+                for i in broken:
+                    results[i] = _parse_inline(*pages[i])
+            return results
+    
+    return [_parse_inline(html, url) for html, url in pages]
+
+
+async def crawl(start_url: str, depth: int = 2, concurrency: int = 5, delay: float = 0.2,
+                session: Optional[aiohttp.ClientSession] = None) -> Dict:
     """
     Crawl start_url up to specified depth.
     
@@ -199,6 +400,8 @@ async def crawl(start_url: str, depth: int = 2, concurrency: int = 5, delay: flo
         depth: Maximum crawling depth
         concurrency: Number of concurrent requests
         delay: Delay between requests (seconds)
+        session: Existing session to crawl with (left open); a pooled
+            session is created for the crawl if omitted
         
     Returns:
         Dictionary with pages, forms, and params
@@ -207,60 +410,62 @@ async def crawl(start_url: str, depth: int = 2, concurrency: int = 5, delay: flo
     console.print(f"[EthioScan] Crawling {start_url} (depth {depth})")
     
     # Initialize crawler
-    async with Crawler(concurrency=concurrency, delay=delay) as crawler:
-        visited_urls: Set[str] = set()
+    async with Crawler(concurrency=concurrency, delay=delay, session=session) as crawler:
+        # URLs are marked visited when queued, so each is queued only once
+        visited_urls: Set[str] = {start_url}
         all_pages: Set[str] = set()
         all_forms: List[Dict] = []
         all_params: List[Dict] = []
         
-        # Queue for BFS crawling
-        url_queue = [(start_url, 0)]  # (url, current_depth)
+        # BFS frontier of (url, current_depth); only URLs within the depth
+        # limit are ever queued, and each pass drains exactly one level
+        url_queue = deque([(start_url, 0)] if depth >= 0 else [])
         
         while url_queue:
-            # Get URLs for current depth level
-            current_depth_urls = [(url, depth_level) for url, depth_level in url_queue if depth_level <= depth]
-            url_queue = [(url, depth_level) for url, depth_level in url_queue if depth_level > depth]
-            
-            if not current_depth_urls:
-                break
-                
             # Process URLs at current depth
-            tasks = []
-            for url, current_depth in current_depth_urls:
-                if url not in visited_urls and current_depth <= depth:
-                    visited_urls.add(url)
-                    task = crawler.semaphore.acquire()
-                    tasks.append((task, url, current_depth))
+            tasks = [url_queue.popleft() for _ in range(len(url_queue))]
+            
+            # Fetch the whole frontier concurrently (bounded by the crawler's
+            # semaphore)
+            results = await asyncio.gather(
+                *(crawler.fetch(url) for url, _ in tasks),
+                return_exceptions=True
+            )
             
-            # Execute tasks
-            for task, url, current_depth in tasks:
-                await task
+            # Keep the pages worth parsing
+            fetched = []
+            for (url, current_depth), result in zip(tasks, results):
                 try:
-                    status, content, final_url = await fetch_page(crawler.session, url)
+                    if isinstance(result, Exception):
+                        raise result
+                    status, content, final_url = result
                     
                     if status == 200 and content:
                         all_pages.add(final_url)
-                        
-                        # Parse HTML
-                        links, forms, params = parse_html(content, final_url)
-                        
-                        # Add forms and params
-                        all_forms.extend(forms)
-                        all_params.extend(params)
-                        
-                        # Add new URLs to queue for next depth
-                        if current_depth < depth:
-                            for link in links:
-                                if link not in visited_urls:
-                                    url_queue.append((link, current_depth + 1))
-                    
-                    # Polite delay
-                    await asyncio.sleep(delay)
+                        fetched.append((url, current_depth, content, final_url))
                     
                 except Exception as e:
                     console.print(f"[red]Error processing {url}: {e}[/red]")
-                finally:
-                    crawler.semaphore.release()
+            
+            # Parse HTML off the event loop when the level is large enough
+            parsed = await _parse_pages([(content, final_url) for _, _, content, final_url in fetched])
+            
+            for (url, current_depth, _, _), result in zip(fetched, parsed):
+                if isinstance(result, Exception):
+                    console.print(f"[red]Error processing {url}: {result}[/red]")
+                    continue
+                links, forms, params = result
+                
+                # Add forms and params
+                all_forms.extend(forms)
+                all_params.extend(params)
+                
+                # Add new URLs to queue for next depth
+                if current_depth < depth:
+                    for link in links:
+                        if link not in visited_urls:
+                            visited_urls.add(link)
+                            url_queue.append((link, current_depth + 1))
     
     # Deduplicate results
     unique_forms = []
@@ -290,6 +495,31 @@ async def crawl(start_url: str, depth: int = 2, concurrency: int = 5, delay: flo
     }
 
 
+def _build_sync_session(pool_size: int = 32) -> requests.Session:
+    """
+    Create a pooled requests session for the synchronous crawler.
+    
+    Requests are not retried, as with the per-call requests.get it replaces.
+    
+    Args:
+        pool_size: Maximum pooled connections per host
+        
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'EthioScan/1.0 (Ethiopian Security Scanner)'
+    })
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
 # Synchronous fallback using requests
 def crawl_sync(start_url: str, depth: int = 2, concurrency: int = 5, delay: float = 0.2) -> Dict:
     """
@@ -309,47 +539,43 @@ def crawl_sync(start_url: str, depth: int = 2, concurrency: int = 5, delay: floa
     start_time = time.time()
     console.print(f"[EthioScan] Crawling {start_url} (depth {depth})")
     
-    visited_urls: Set[str] = set()
+    visited_urls: Set[str] = {start_url}
     all_pages: Set[str] = set()
     all_forms: List[Dict] = []
     all_params: List[Dict] = []
     
-    url_queue = [(start_url, 0)]
+    url_queue = deque([(start_url, 0)] if depth >= 0 else [])
     
-    while url_queue:
-        current_depth_urls = [(url, depth_level) for url, depth_level in url_queue if depth_level <= depth]
-        url_queue = [(url, depth_level) for url, depth_level in url_queue if depth_level > depth]
-        
-        if not current_depth_urls:
-            break
+    # One pooled session for the whole crawl so keep-alive connections
+    # (and their TLS handshakes) are reused across pages
+    with _build_sync_session() as session:
+        while url_queue:
+            url, current_depth = url_queue.popleft()
             
-        for url, current_depth in current_depth_urls:
-            if url not in visited_urls and current_depth <= depth:
-                visited_urls.add(url)
-                
-                try:
-                    response = requests.get(url, timeout=10, allow_redirects=True)
-                    if response.status_code == 200:
-                        all_pages.add(response.url)
-                        
-                        # Parse HTML
-                        links, forms, params = parse_html(response.text, response.url)
-                        
-                        # Add forms and params
-                        all_forms.extend(forms)
-                        all_params.extend(params)
-                        
-                        # Add new URLs to queue for next depth
-                        if current_depth < depth:
-                            for link in links:
-                                if link not in visited_urls:
-                                    url_queue.append((link, current_depth + 1))
+            try:
+                response = session.get(url, timeout=10, allow_redirects=True)
+                if response.status_code == 200:
+                    all_pages.add(response.url)
                     
-                    # Polite delay
-                    time.sleep(delay)
+                    # Parse HTML
+                    links, forms, params = parse_html(response.text, response.url)
                     
-                except Exception as e:
-                    console.print(f"[red]Error processing {url}: {e}[/red]")
+                    # Add forms and params
+                    all_forms.extend(forms)
+                    all_params.extend(params)
+                    
+                    # Add new URLs to queue for next depth
+                    if current_depth < depth:
+                        for link in links:
+                            if link not in visited_urls:
+                                visited_urls.add(link)
+                                url_queue.append((link, current_depth + 1))
+                
+                # Polite delay
+                time.sleep(delay)
+                
+            except Exception as e:
+                console.print(f"[red]Error processing {url}: {e}[/red]")
     
     # Deduplicate results (same as async version)
     unique_forms = []
@@ -1,11 +1,28 @@
 import sqlite3
 import os
-from typing import List, Dict
+from contextlib import contextmanager
+from itertools import islice
+from typing import List, Dict, Iterator, Optional
 
 DB_FILE = os.path.join(os.path.dirname(__file__), "ethioscan.db")
 
-def initialize_db():
+# Rows per executemany batch when saving findings
+FINDINGS_CHUNK = 500
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    # One connection and one commit for a batch of writes
     conn = sqlite3.connect(DB_FILE)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+def initialize_db(conn: Optional[sqlite3.Connection] = None):
+    if conn is None:
+        with transaction() as conn:
+            return initialize_db(conn)
     c = conn.cursor()
     c.execute("""
         CREATE TABLE IF NOT EXISTS scans (
@@ -32,11 +49,11 @@ def initialize_db():
             FOREIGN KEY(scan_id) REFERENCES scans(id)
         )
     """)
-    conn.commit()
-    conn.close()
 
-def save_scan(scan_info: Dict) -> int:
-    conn = sqlite3.connect(DB_FILE)
+def save_scan(scan_info: Dict, conn: Optional[sqlite3.Connection] = None) -> int:
+    if conn is None:
+        with transaction() as conn:
+            return save_scan(scan_info, conn)
     c = conn.cursor()
     c.execute("""
         INSERT INTO scans (target_url, scan_time, depth, concurrency, max_tests, lab_mode, total_findings)
@@ -50,19 +67,14 @@ def save_scan(scan_info: Dict) -> int:
         int(scan_info.get("lab_mode", False)),
         scan_info.get("total_findings", 0)
     ))
-    scan_id = c.lastrowid
-    conn.commit()
-    conn.close()
-    return scan_id
+    return c.lastrowid
 
-def save_findings(scan_id: int, findings: List[Dict]):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    for f in findings:
-        c.execute("""
-            INSERT OR REPLACE INTO findings (id, scan_id, url, param, payload, category, severity, evidence)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+def save_findings(scan_id: int, findings: List[Dict], conn: Optional[sqlite3.Connection] = None):
+    if conn is None:
+        with transaction() as conn:
+            return save_findings(scan_id, findings, conn)
+    rows = (
+        (
             f.get("id"),
             scan_id,
             f.get("url"),
@@ -71,6 +83,14 @@ def save_findings(scan_id: int, findings: List[Dict]):
             f.get("category"),
             f.get("severity"),
             f.get("evidence")
-        ))
-    conn.commit()
-    conn.close()
+        )
+        for f in findings
+    )
+    while True:
+        chunk = list(islice(rows, FINDINGS_CHUNK))
+        if not chunk:
+            break
+        conn.executemany("""
+            INSERT OR REPLACE INTO findings (id, scan_id, url, param, payload, category, severity, evidence)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, chunk)
@@ -2,16 +2,54 @@
 EthioScan Fuzzer - Test case generation and submission for vulnerability scanning
 """
 
+import re
+import shlex
 import uuid
 import time
 import asyncio
-from typing import Dict, List, Any, Iterable, Optional
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+import threading
+from collections import Counter
+from functools import lru_cache
+from itertools import count, product
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+from urllib.parse import ParseResult, urlparse, parse_qs, urlencode
 import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 from ethioscan.payloads import get_payloads, is_lab_only_payload
 
 
+# Test case ids: one random UUID per process plus a running counter. Unique
+# across runs (the prefix) and within a run (the counter), without paying
+# for an os.urandom() call per test case
+_ID_PREFIX = uuid.uuid4().hex
+_id_counter = count()
+
+
+def _new_id() -> str:
+    """
+    Generate a unique test case id.
+    
+    Returns:
+        Id string of the form "<process uuid hex>-<counter>"
+    """
+    return f"{_ID_PREFIX}-{next(_id_counter)}"
+
+
+# Literal SQL error tokens for quick_precheck. Plain substring checks beat a
+# regex alternation here since most tokens do not share a leading character
+_PRECHECK_SQL_ERRORS = (
+    "sql syntax", "mysql", "postgresql", "oracle", "sqlite",
+    "database error", "sql error", "query failed"
+)
+
+# XSS tags for quick_precheck, compiled into one alternation; all start with
+# "<", so the regex engine skips ahead quickly between candidate positions
+_PRECHECK_XSS_TAG_RE = re.compile("|".join(re.escape(token) for token in (
+    "<script>", "<img", "<svg", "<iframe", "<body"
+)))
+
+
 def generate_tests_from_params(params: List[Dict], payloads: Dict, max_per_param: int = 3) -> Iterable[Dict]:
     """
     Generate test cases from discovered URL parameters.
@@ -24,41 +62,34 @@ def generate_tests_from_params(params: List[Dict], payloads: Dict, max_per_param
     Yields:
         Test case dictionaries with id, method, url, param, payload, etc.
     """
+    # Payloads (limited per parameter) with their lab-only flag, resolved once
+    flat_payloads = _flatten_payloads(payloads, max_per_param)
+    
     for param_item in params:
         url = param_item["url"]
         param_names = param_item["params"]
         
-        # Parse the original URL to preserve other parameters
-        parsed_url = urlparse(url)
-        original_params = parse_qs(parsed_url.query)
+        # Parse the original URL once; every payload reuses the parse
+        parsed_url, original_params = _parse_for_fuzz(url)
         
-        for param_name in param_names:
-            # Generate tests for each payload category
-            for category, payload_list in payloads.items():
-                # Skip IDOR numeric for non-numeric parameters (basic heuristic)
-                if category == "idor_numeric" and not _is_numeric_param(param_name):
-                    continue
-                
-                # Limit payloads per parameter
-                limited_payloads = payload_list[:max_per_param]
-                
-                for payload_item in limited_payloads:
-                    # Create test case
-                    test_case = {
-                        "id": str(uuid.uuid4()),
-                        "method": "GET",
-                        "url": _build_test_url(url, param_name, payload_item, category),
-                        "param": param_name,
-                        "payload": payload_item,
-                        "origin": "param",
-                        "meta": {
-                            "category": category,
-                            "lab_only": is_lab_only_payload(category, payload_item)
-                        },
-                        "crawl_ref": param_item
-                    }
-                    
-                    yield test_case
+        for param_name, (category, payload_item, lab_only) in product(param_names, flat_payloads):
+            # Skip IDOR numeric for non-numeric parameters (basic heuristic)
+            if category == "idor_numeric" and not _is_numeric_param(param_name):
+                continue
+            
+            # Create test case
+            test_case = {
+                "id": _new_id(),
+                "method": "GET",
+                "url": _inject(parsed_url, original_params, param_name, payload_item, category),
+                "param": param_name,
+                "payload": payload_item,
+                "origin": "param",
+                "meta": {"category": category, "lab_only": lab_only},
+                "crawl_ref": param_item
+            }
+            
+            yield test_case
 
 
 def generate_tests_from_forms(forms: List[Dict], payloads: Dict, max_samples: int = 3) -> Iterable[Dict]:
@@ -73,42 +104,53 @@ def generate_tests_from_forms(forms: List[Dict], payloads: Dict, max_samples: in
     Yields:
         Test case dictionaries with form-specific fields
     """
+    # IDOR numeric payloads do not apply to form inputs
+    flat_payloads = [
+        entry for entry in _flatten_payloads(payloads, max_samples)
+        if entry[0] != "idor_numeric"
+    ]
+    
     for form in forms:
         form_url = form["url"]
         form_action = form["action"]
         form_method = form["method"].upper()
         form_inputs = form["inputs"]
         
-        # Generate tests for each input field
-        for input_name in form_inputs:
-            # Generate tests for each payload category
-            for category, payload_list in payloads.items():
-                # Skip IDOR numeric for form inputs (not applicable)
-                if category == "idor_numeric":
-                    continue
-                
-                # Limit payloads per input
-                limited_payloads = payload_list[:max_samples]
-                
-                for payload_item in limited_payloads:
-                    # Create test case
-                    test_case = {
-                        "id": str(uuid.uuid4()),
-                        "method": form_method,
-                        "url": form_action,
-                        "param": input_name,
-                        "payload": payload_item,
-                        "origin": "form",
-                        "meta": {
-                            "category": category,
-                            "lab_only": is_lab_only_payload(category, payload_item)
-                        },
-                        "crawl_ref": form,
-                        "form_action": form_action,
-                        "form_inputs": form_inputs
-                    }
-                    
-                    yield test_case
+        # Generate tests for each input field and payload
+        for input_name, (category, payload_item, lab_only) in product(form_inputs, flat_payloads):
+            # Create test case
+            test_case = {
+                "id": _new_id(),
+                "method": form_method,
+                "url": form_action,
+                "param": input_name,
+                "payload": payload_item,
+                "origin": "form",
+                "meta": {"category": category, "lab_only": lab_only},
+                "crawl_ref": form,
+                "form_action": form_action,
+                "form_inputs": form_inputs
+            }
+            
+            yield test_case
+
+
+def _flatten_payloads(payloads: Dict, limit: int) -> List[Tuple[str, Dict, bool]]:
+    """
+    Flatten a payload dictionary into (category, payload, lab_only) entries.
+    
+    Args:
+        payloads: Payload dictionary from get_payloads()
+        limit: Maximum number of payloads taken from each category
+        
+    Returns:
+        List of (category, payload_item, lab_only) tuples in category order
+    """
+    return [
+        (category, payload_item, is_lab_only_payload(category, payload_item))
+        for category, payload_list in payloads.items()
+        for payload_item in payload_list[:limit]
+    ]
 
 
 def generate_curl_command(test_case: Dict) -> str:
@@ -137,10 +179,7 @@ def generate_curl_command(test_case: Dict) -> str:
             for input_name in test_case["form_inputs"]:
                 if input_name == param:
                     # Insert payload
-                    if isinstance(payload, dict) and "payload" in payload:
-                        form_data[input_name] = payload["payload"]
-                    else:
-                        form_data[input_name] = str(payload)
+                    form_data[input_name] = _payload_text(payload)
                 else:
                     # Use benign value
                     form_data[input_name] = "test_value"
@@ -149,10 +188,7 @@ def generate_curl_command(test_case: Dict) -> str:
             curl_parts.extend(["-d", urlencode(form_data)])
         else:
             # Simple POST with single parameter
-            if isinstance(payload, dict) and "payload" in payload:
-                payload_value = payload["payload"]
-            else:
-                payload_value = str(payload)
+            payload_value = _payload_text(payload)
             
             curl_parts.extend(["-d", f"{param}={urlencode({'': payload_value})[2:]}"])
     else:
@@ -160,13 +196,14 @@ def generate_curl_command(test_case: Dict) -> str:
         pass
     
     # Add URL
-    curl_parts.append(f'"{url}"')
+    curl_parts.append(url)
     
     # Add headers
-    curl_parts.extend(["-H", '"User-Agent: EthioScan/1.0"'])
-    curl_parts.extend(["-H", '"Accept: text/html,application/xhtml+xml"'])
+    curl_parts.extend(["-H", "User-Agent: EthioScan/1.0"])
+    curl_parts.extend(["-H", "Accept: text/html,application/xhtml+xml"])
     
-    return " ".join(curl_parts)
+    # Quote each argument for the shell (form data can contain "&")
+    return shlex.join(curl_parts)
 
 
 async def submit_test_case(session: aiohttp.ClientSession, test_case: Dict, timeout: int = 10) -> Dict:
@@ -192,10 +229,7 @@ async def submit_test_case(session: aiohttp.ClientSession, test_case: Dict, time
                 for input_name in test_case["form_inputs"]:
                     if input_name == test_case["param"]:
                         # Insert payload
-                        if isinstance(test_case["payload"], dict) and "payload" in test_case["payload"]:
-                            form_data[input_name] = test_case["payload"]["payload"]
-                        else:
-                            form_data[input_name] = str(test_case["payload"])
+                        form_data[input_name] = _payload_text(test_case["payload"])
                     else:
                         # Use benign value
                         form_data[input_name] = "test_value"
@@ -218,10 +252,7 @@ async def submit_test_case(session: aiohttp.ClientSession, test_case: Dict, time
                     }
             else:
                 # Simple POST
-                if isinstance(test_case["payload"], dict) and "payload" in test_case["payload"]:
-                    payload_value = test_case["payload"]["payload"]
-                else:
-                    payload_value = str(test_case["payload"])
+                payload_value = _payload_text(test_case["payload"])
                 
                 form_data = {test_case["param"]: payload_value}
                 
@@ -271,6 +302,37 @@ async def submit_test_case(session: aiohttp.ClientSession, test_case: Dict, time
         }
 
 
+# Headers sent with every synchronous test case submission
+_SYNC_HEADERS = {
+    'User-Agent': 'EthioScan/1.0 (Ethiopian Security Scanner)',
+    'Accept': 'text/html,application/xhtml+xml'
+}
+
+# Pooled session shared by all synchronous submissions; fuzzing sends many
+# requests to one host, so keep-alive connections save a handshake each
+_sync_session: Optional[requests.Session] = None
+_sync_session_lock = threading.Lock()
+
+
+def _get_sync_session() -> requests.Session:
+    """
+    Get the shared requests session, creating it on first use.
+    
+    Returns:
+        Pooled requests.Session
+    """
+    global _sync_session
+    if _sync_session is None:
+        with _sync_session_lock:
+            if _sync_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _sync_session = session
+    return _sync_session
+
+
 def submit_test_case_sync(test_case: Dict, timeout: int = 10) -> Dict:
     """
     Submit a test case using synchronous requests (fallback).
@@ -285,10 +347,8 @@ def submit_test_case_sync(test_case: Dict, timeout: int = 10) -> Dict:
     start_time = time.time()
     
     try:
-        headers = {
-            'User-Agent': 'EthioScan/1.0 (Ethiopian Security Scanner)',
-            'Accept': 'text/html,application/xhtml+xml'
-        }
+        session = _get_sync_session()
+        headers = _SYNC_HEADERS
         
         if test_case["method"] == "POST":
             # Handle POST request
@@ -298,15 +358,12 @@ def submit_test_case_sync(test_case: Dict, timeout: int = 10) -> Dict:
                 for input_name in test_case["form_inputs"]:
                     if input_name == test_case["param"]:
                         # Insert payload
-                        if isinstance(test_case["payload"], dict) and "payload" in test_case["payload"]:
-                            form_data[input_name] = test_case["payload"]["payload"]
-                        else:
-                            form_data[input_name] = str(test_case["payload"])
+                        form_data[input_name] = _payload_text(test_case["payload"])
                     else:
                         # Use benign value
                         form_data[input_name] = "test_value"
                 
-                response = requests.post(
+                response = session.post(
                     test_case["url"],
                     data=form_data,
                     headers=headers,
@@ -315,14 +372,11 @@ def submit_test_case_sync(test_case: Dict, timeout: int = 10) -> Dict:
                 )
             else:
                 # Simple POST
-                if isinstance(test_case["payload"], dict) and "payload" in test_case["payload"]:
-                    payload_value = test_case["payload"]["payload"]
-                else:
-                    payload_value = str(test_case["payload"])
+                payload_value = _payload_text(test_case["payload"])
                 
                 form_data = {test_case["param"]: payload_value}
                 
-                response = requests.post(
+                response = session.post(
                     test_case["url"],
                     data=form_data,
                     headers=headers,
@@ -331,7 +385,7 @@ def submit_test_case_sync(test_case: Dict, timeout: int = 10) -> Dict:
                 )
         else:
             # Handle GET request
-            response = requests.get(
+            response = session.get(
                 test_case["url"],
                 headers=headers,
                 timeout=timeout,
@@ -376,11 +430,7 @@ async def quick_precheck(session: aiohttp.ClientSession, test_case: Dict, timeou
         response = await submit_test_case(session, test_case, timeout)
         
         # Check for payload reflection
-        payload_str = ""
-        if isinstance(test_case["payload"], dict) and "payload" in test_case["payload"]:
-            payload_str = test_case["payload"]["payload"]
-        else:
-            payload_str = str(test_case["payload"])
+        payload_str = _payload_text(test_case["payload"])
         
         body = response.get("body", "").lower()
         payload_lower = payload_str.lower()
@@ -389,14 +439,9 @@ async def quick_precheck(session: aiohttp.ClientSession, test_case: Dict, timeou
         payload_reflected = payload_lower in body
         
         # Check for common error patterns
-        sql_errors = any(error in body for error in [
-            "sql syntax", "mysql", "postgresql", "oracle", "sqlite",
-            "database error", "sql error", "query failed"
-        ])
+        sql_errors = any(token in body for token in _PRECHECK_SQL_ERRORS)
         
-        xss_reflected = any(tag in body for tag in [
-            "<script>", "<img", "<svg", "<iframe", "<body"
-        ]) and payload_reflected
+        xss_reflected = payload_reflected and _PRECHECK_XSS_TAG_RE.search(body) is not None
         
         return {
             "payload_reflected": payload_reflected,
@@ -430,9 +475,39 @@ def _build_test_url(original_url: str, param_name: str, payload_item: Dict, cate
     Returns:
         Modified URL with payload injected
     """
-    parsed_url = urlparse(original_url)
-    original_params = parse_qs(parsed_url.query)
+    parsed_url, original_params = _parse_for_fuzz(original_url)
+    return _inject(parsed_url, original_params, param_name, payload_item, category)
+
+
+def _parse_for_fuzz(url: str) -> Tuple[ParseResult, Dict[str, List[str]]]:
+    """
+    Parse a URL into its components and query parameters for injection.
+    
+    Args:
+        url: URL to parse
+        
+    Returns:
+        Tuple of (parsed URL, query parameter dictionary)
+    """
+    parsed_url = urlparse(url)
+    return parsed_url, parse_qs(parsed_url.query)
+
+
+def _inject(parsed_url: ParseResult, original_params: Dict[str, List[str]],
+            param_name: str, payload_item: Dict, category: str) -> str:
+    """
+    Rebuild a parsed URL with the payload injected into one parameter.
     
+    Args:
+        parsed_url: URL parsed by _parse_for_fuzz
+        original_params: Query parameters parsed by _parse_for_fuzz (not modified)
+        param_name: Parameter name to inject payload into
+        payload_item: Payload dictionary
+        category: Payload category
+        
+    Returns:
+        Modified URL with payload injected
+    """
     # Get payload value
     if category == "idor_numeric":
         # Handle IDOR numeric payloads specially
@@ -453,23 +528,38 @@ def _build_test_url(original_url: str, param_name: str, payload_item: Dict, cate
         else:
             payload_value = str(payload_item)
     
-    # Update the parameter
-    original_params[param_name] = [payload_value]
+    # Update the parameter on a copy so the shared parse stays intact
+    params = dict(original_params)
+    params[param_name] = [payload_value]
     
     # Rebuild URL
-    new_query = urlencode(original_params, doseq=True)
-    new_url = urlunparse((
-        parsed_url.scheme,
-        parsed_url.netloc,
-        parsed_url.path,
-        parsed_url.params,
-        new_query,
-        parsed_url.fragment
-    ))
+    return parsed_url._replace(query=urlencode(params, doseq=True)).geturl()
+
+
+def _payload_text(payload: Any) -> str:
+    """
+    Get the string to inject for a payload item.
     
-    return new_url
+    Args:
+        payload: Payload dictionary or raw payload value
+        
+    Returns:
+        Payload string
+    """
+    # Fast path: raw string payloads need no conversion
+    if type(payload) is str:
+        return payload
+    if isinstance(payload, dict) and "payload" in payload:
+        return payload["payload"]
+    return str(payload)
 
 
+# Substrings that mark a parameter name as likely numeric. Compound names
+# such as "user_id" or "product_id" are covered by "id"
+_NUMERIC_INDICATORS = ("id", "page", "offset", "limit", "count", "num", "index")
+
+
+@lru_cache(maxsize=1024)
 def _is_numeric_param(param_name: str) -> bool:
     """
     Basic heuristic to determine if a parameter is likely numeric.
@@ -480,13 +570,8 @@ def _is_numeric_param(param_name: str) -> bool:
     Returns:
         True if parameter appears to be numeric
     """
-    numeric_indicators = [
-        "id", "page", "offset", "limit", "count", "num", "index",
-        "user_id", "item_id", "product_id", "order_id"
-    ]
-    
     param_lower = param_name.lower()
-    return any(indicator in param_lower for indicator in numeric_indicators)
+    return any(indicator in param_lower for indicator in _NUMERIC_INDICATORS)
 
 
 def get_test_case_summary(test_cases: List[Dict]) -> Dict[str, int]:
@@ -499,24 +584,21 @@ def get_test_case_summary(test_cases: List[Dict]) -> Dict[str, int]:
     Returns:
         Summary dictionary with counts by category and origin
     """
-    summary = {
-        "total": len(test_cases),
-        "by_category": {},
-        "by_origin": {"param": 0, "form": 0},
-        "lab_only": 0
-    }
+    by_category = Counter()
+    by_origin = Counter({"param": 0, "form": 0})
+    lab_only = 0
     
+    # Single pass over the test cases
     for test_case in test_cases:
-        # Count by category
-        category = test_case["meta"]["category"]
-        summary["by_category"][category] = summary["by_category"].get(category, 0) + 1
-        
-        # Count by origin
-        origin = test_case["origin"]
-        summary["by_origin"][origin] += 1
-        
-        # Count lab-only
-        if test_case["meta"]["lab_only"]:
-            summary["lab_only"] += 1
+        meta = test_case["meta"]
+        by_category[meta["category"]] += 1
+        by_origin[test_case["origin"]] += 1
+        if meta["lab_only"]:
+            lab_only += 1
     
-    return summary
+    return {
+        "total": len(test_cases),
+        "by_category": dict(by_category),
+        "by_origin": dict(by_origin),
+        "lab_only": lab_only
+    }
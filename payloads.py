@@ -2,6 +2,7 @@
 EthioScan Payloads - Security test payloads for vulnerability scanning
 """
 
+from functools import lru_cache
 from typing import Dict, List, Any
 
 # Default payload sets for different vulnerability types
@@ -70,10 +71,14 @@ DEFAULT_PAYLOADS = {
 }
 
 
+@lru_cache(maxsize=None)
 def get_payloads(profile: str = "safe") -> Dict[str, List[Dict[str, Any]]]:
     """
     Get payload sets for the specified profile.
     
+    Each profile's dictionary is built once and shared between callers, so
+    it must be treated as read-only (as DEFAULT_PAYLOADS always was).
+    
     Args:
         profile: Profile name ("safe", "lab", "all")
         
@@ -121,11 +126,29 @@ def is_lab_only_payload(payload_category: str, payload: Dict[str, Any]) -> bool:
         return True
     
     # Check payload note for lab-only indication
-    note = payload.get("note", "").lower()
-    if "lab-only" in note or "destructive" in note:
-        return True
+    return _is_lab_only_note(payload.get("note", ""))
+
+
+# Markers in a payload note that flag it as lab-only
+_LAB_ONLY_MARKERS = ("lab-only", "destructive")
+
+
+@lru_cache(maxsize=256)
+def _is_lab_only_note(note: str) -> bool:
+    """
+    Check a payload note for lab-only markers.
+    
+    Notes repeat across every test case built from the same payload, so
+    the lowercase-and-search result is cached per note string.
     
-    return False
+    Args:
+        note: Payload note text
+        
+    Returns:
+        True if the note marks the payload as lab-only
+    """
+    note = note.lower()
+    return any(marker in note for marker in _LAB_ONLY_MARKERS)
 
 
 def get_payload_categories() -> List[str]:
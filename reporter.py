@@ -3,6 +3,21 @@ import json
 from datetime import datetime
 import os
 
+try:
+    import orjson
+except ImportError:  # optional, faster JSON decoding
+    orjson = None
+
+# Buffer size for report file writes (1 MiB)
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Resolved once at import; avoids redoing path work on every report
+_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# Finding fields rendered as report columns
+_FINDING_FIELDS = ("id", "url", "param", "payload", "category", "severity", "evidence")
+
+
 def generate_report(findings_file: str, output_file: str):
     """
     Generate an HTML report from JSON scan findings.
@@ -11,10 +26,14 @@ def generate_report(findings_file: str, output_file: str):
         findings_file: Path to JSON file containing scan findings.
         output_file: Path to save the HTML report.
     """
-    # Load findings JSON
+    # Load findings JSON (orjson.JSONDecodeError subclasses json's)
     try:
-        with open(findings_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if orjson is not None:
+            with open(findings_file, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(findings_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
     except FileNotFoundError:
         print(f"[Error] Findings file '{findings_file}' not found.")
         return
@@ -26,37 +45,22 @@ def generate_report(findings_file: str, output_file: str):
     scan_info = data.get("scan_info", {})
     findings = data.get("findings", [])
 
-    # Prepare severity counts for color-coding
-    severity_colors = {
-        "critical": "red",
-        "high": "red",
-        "medium": "orange",
-        "low": "green",
-        "unknown": "gray"
-    }
-
-    # Ensure all findings have necessary keys
-    for f in findings:
-        f.setdefault("id", "-")
-        f.setdefault("url", "-")
-        f.setdefault("param", "-")
-        f.setdefault("payload", "-")
-        f.setdefault("category", "-")
-        f.setdefault("severity", "unknown")
-        f.setdefault("evidence", "-")
-        f["color"] = severity_colors.get(f["severity"].lower(), "gray")
+    # Build one column list per field so the template indexes into
+    # homogeneous lists; missing-value defaults are applied in the template
+    columns = {key: [f.get(key) for f in findings] for key in _FINDING_FIELDS}
 
     # Load Jinja2 template
     env = Environment(
-        loader=FileSystemLoader(os.path.join(os.path.dirname(__file__), "templates")),
+        loader=FileSystemLoader(_TEMPLATE_DIR),
         autoescape=True
     )
     template = env.get_template("report_template.html")
 
-    # Render HTML
-    html_content = template.render(
+    # Render HTML as a stream of chunks
+    html_stream = template.stream(
         scan_info=scan_info,
-        findings=findings,
+        n=len(findings),
+        cols=columns,
         timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     )
 
@@ -65,9 +69,9 @@ def generate_report(findings_file: str, output_file: str):
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
 
-    # Save HTML
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(html_content)
+    # Save HTML, encoding chunks straight into a large binary buffer
+    with open(output_file, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        html_stream.dump(f, encoding="utf-8")
 
     print(f"[Success] Report generated: {output_file}")
 
@@ -4,24 +4,208 @@ EthioScan Run Scan - End-to-end vulnerability scanning orchestrator
 
 import argparse
 import asyncio
+import functools
 import json
+import multiprocessing
 import os
 import sys
 import time
-from typing import Dict, List, Any
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, islice
+from typing import Dict, List, Any, Optional, FrozenSet, Iterable
 from urllib.parse import urlparse
 
+import aiohttp
+
+try:
+    import orjson
+except ImportError:  # optional, faster JSON encoding
+    orjson = None
+
 # Package imports (run_scan.py lives inside ethioscan/)
 from ethioscan.crawler import crawl
 from ethioscan.payloads import get_payloads
 from ethioscan.fuzzer import generate_tests_from_params, generate_tests_from_forms, submit_test_case
-from ethioscan.scanner import Scanner
+from ethioscan.scanner import Scanner, DEFAULT_SCAN_LIMIT
 
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 
 console = Console()
 
+# Buffer size for findings/report file writes (1 MiB)
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Bodies at least this long (in characters) are analyzed in a worker
+# process; below it, pickling and IPC cost more than the scan itself
+ANALYZE_POOL_MIN_BODY = 256 * 1024
+
+# Test case fields read by Scanner.analyze_response; only these are sent
+# to analysis workers, not the crawl references each test case carries
+_ANALYZE_FIELDS = ("id", "param", "url", "method", "payload")
+
+# Created lazily by _get_analyze_pool
+_analyze_pool: Optional[ProcessPoolExecutor] = None
+
+# Per-process scanners used by _analyze_in_worker, keyed by settings
+_worker_scanners: Dict[tuple, Scanner] = {}
+
+# Severity display order and console colors
+_SEVERITY_ORDER = ("critical", "high", "medium", "low")
+_SEVERITY_COLORS = {
+    "critical": "red",
+    "high": "red",
+    "medium": "yellow",
+    "low": "blue",
+    "unknown": "gray"
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_host(url: str) -> str:
+    """
+    Get the lowercase host of a URL without its port.
+
+    Args:
+        url: URL to parse
+
+    Returns:
+        Host name
+    """
+    return urlparse(url).netloc.lower().split(':')[0]
+
+
+@functools.lru_cache(maxsize=1)
+def _load_allowlist() -> FrozenSet[str]:
+    """
+    Load allowed domains from allowlist.txt (read once per process).
+
+    Returns:
+        Frozenset of lowercase domain names
+    """
+    allowlist_file = os.path.join(os.path.dirname(__file__), 'allowlist.txt')
+
+    try:
+        with open(allowlist_file, 'r', encoding='utf-8') as f:
+            return frozenset(
+                line.lower() for line in (raw.strip() for raw in f)
+                if line and not line.startswith('#')
+            )
+    except FileNotFoundError:
+        console.print("[yellow]Warning: allowlist.txt not found. All domains will require confirmation.[/yellow]")
+        return frozenset()
+
+
+def _dumps_indented(obj: Any) -> bytes:
+    """
+    Encode an object as 2-space indented UTF-8 JSON.
+
+    Uses orjson when it is installed, falling back to the stdlib encoder.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        Encoded JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _encode_finding(finding: Dict[str, Any]) -> bytes:
+    """
+    Encode one finding as it appears inside the findings array.
+
+    Args:
+        finding: Vulnerability finding
+
+    Returns:
+        Encoded JSON bytes, indented for the "findings" list
+    """
+    return _dumps_indented(finding).replace(b"\n", b"\n    ")
+
+
+def _write_findings_json(f, scan_info: Dict[str, Any], encoded_findings: Iterable[bytes]) -> None:
+    """
+    Stream the findings document to an open binary file as UTF-8.
+
+    Findings arrive already encoded (see _encode_finding), so the full
+    document is never held in memory as one string.
+
+    Args:
+        f: Writable binary file object
+        scan_info: Scan metadata dictionary
+        encoded_findings: Encoded vulnerability findings
+    """
+    f.write(b'{\n  "scan_info": ')
+    f.write(_dumps_indented(scan_info).replace(b"\n", b"\n  "))
+    f.write(b',\n  "findings": [')
+
+    empty = True
+    for chunk in encoded_findings:
+        f.write(b"\n    " if empty else b",\n    ")
+        f.write(chunk)
+        empty = False
+
+    f.write(b"]\n}" if empty else b"\n  ]\n}")
+
+
+def _get_analyze_pool() -> ProcessPoolExecutor:
+    """
+    Get the worker pool used for analyzing large responses, creating it on first use.
+
+    Returns:
+        Shared ProcessPoolExecutor
+    """
+    global _analyze_pool
+    if _analyze_pool is None:
+        # Spawned, not forked: by the time the pool starts, Rich's refresh
+        # thread and aiohttp's resolver threads are running, and a forked
+        # child could inherit one of their locks in a held state
+        _analyze_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _analyze_pool
+
+
+def _shutdown_analyze_pool(wait: bool = False) -> None:
+    """
+    Shut down the analysis pool, if any, so the next use starts a fresh one.
+
+    Args:
+        wait: Wait for worker processes to exit (False when discarding a
+            broken pool mid-scan)
+    """
+    global _analyze_pool
+    if _analyze_pool is not None:
+        _analyze_pool.shutdown(wait=wait, cancel_futures=True)
+        _analyze_pool = None
+
+
+def _analyze_in_worker(fast: bool, scan_limit: Optional[int], test_case: Dict[str, Any],
+                       response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Analyze a response in a worker process with that process's own Scanner.
+
+    Args:
+        fast: Scanner fast mode flag
+        scan_limit: Scanner scan limit
+        test_case: Test case dictionary (analysis fields only)
+        response: HTTP response dictionary
+
+    Returns:
+        Finding dictionary or None
+    """
+    key = (fast, scan_limit)
+    scanner = _worker_scanners.get(key)
+    if scanner is None:
+        scanner = _worker_scanners[key] = Scanner(fast=fast, scan_limit=scan_limit)
+    return scanner.analyze_response(test_case, response)
+
 
 class EthioScanOrchestrator:
     """
@@ -36,9 +220,22 @@ class EthioScanOrchestrator:
             args: Parsed command line arguments
         """
         self.args = args
-        self.scanner = Scanner(fast=False)
+        # A scan limit of 0 scans whole bodies
+        scan_limit = getattr(args, "scan_limit", DEFAULT_SCAN_LIMIT)
+        self.scanner = Scanner(fast=False, scan_limit=scan_limit or None)
         self.findings: List[Dict[str, Any]] = []
 
+        # Scan start timestamp shared by the findings file and summary
+        self.scan_started_at = time.strftime("%Y-%m-%d %H:%M:%S")
+
+        # Target host without port, parsed once
+        self._domain = _normalize_host(args.url)
+
+        # Large-body analysis offload: disabled if the pool cannot start,
+        # and pool failures are reported once rather than per response
+        self._use_analyze_pool = True
+        self._analyze_pool_warned = False
+
     def check_allowlist(self) -> bool:
         """
         Check if the target URL is in the allowlist or user has provided confirmation.
@@ -46,25 +243,9 @@ class EthioScanOrchestrator:
         Returns:
             True if allowed, False otherwise
         """
-        parsed_url = urlparse(self.args.url)
-        domain = parsed_url.netloc.lower()
-
-        # Remove port if present
-        if ':' in domain:
-            domain = domain.split(':')[0]
+        domain = self._domain
 
-        # Check allowlist file
-        allowlist_file = os.path.join(os.path.dirname(__file__), 'allowlist.txt')
-        allowed_domains = set()
-
-        try:
-            with open(allowlist_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        allowed_domains.add(line.lower())
-        except FileNotFoundError:
-            console.print("[yellow]Warning: allowlist.txt not found. All domains will require confirmation.[/yellow]")
+        allowed_domains = _load_allowlist()
 
         # Check if domain is allowed
         if domain in allowed_domains:
@@ -84,10 +265,34 @@ class EthioScanOrchestrator:
         console.print("\n[bold red]EthioScan will not scan unauthorized targets.[/bold red]")
         return False
 
-    async def run_crawler(self) -> Dict[str, Any]:
+    def open_session(self) -> aiohttp.ClientSession:
+        """
+        Create the pooled HTTP session used for crawling and testing.
+
+        Keep-alive connections and cached DNS lookups are reused across
+        every request instead of being rebuilt per phase or per request.
+
+        Returns:
+            aiohttp ClientSession (use as an async context manager)
+        """
+        connector = aiohttp.TCPConnector(
+            limit=self.args.concurrency,
+            use_dns_cache=True,
+            ttl_dns_cache=3600
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=10),
+            headers={'User-Agent': 'EthioScan/1.0 (Ethiopian Security Scanner)'}
+        )
+
+    async def run_crawler(self, session: Optional[aiohttp.ClientSession] = None) -> Dict[str, Any]:
         """
         Run the crawler to discover pages, forms, and parameters.
 
+        Args:
+            session: Shared HTTP session; the crawler opens its own if omitted
+
         Returns:
             Crawler results dictionary
         """
@@ -99,7 +304,8 @@ class EthioScanOrchestrator:
                 start_url=self.args.url,
                 depth=self.args.depth,
                 concurrency=self.args.concurrency,
-                delay=0.2
+                delay=0.2,
+                session=session
             )
 
             console.print(f"[green]Crawling completed![/green]")
@@ -133,78 +339,171 @@ class EthioScanOrchestrator:
         console.print(f"[blue]Using payload profile: {profile}[/blue]")
         console.print(f"[blue]Payload categories: {list(payloads.keys())}[/blue]")
 
-        # Generate test cases from parameters
-        param_tests = list(generate_tests_from_params(
-            crawl_results.get("params", []),
-            payloads,
-            max_per_param=2
-        ))
-
-        # Generate test cases from forms
-        form_tests = list(generate_tests_from_forms(
-            crawl_results.get("forms", []),
-            payloads,
-            max_samples=2
-        ))
-
-        # Combine and limit tests
-        all_tests = param_tests + form_tests
+        # Filter counters, filled in as the generators are consumed
+        counts = {"lab_only": 0, "duplicate": 0}
+
+        # Chain parameter and form tests lazily so that at most
+        # max_tests test cases are ever materialized
+        test_stream = chain(
+            generate_tests_from_params(
+                crawl_results.get("params", []),
+                payloads,
+                max_per_param=2
+            ),
+            generate_tests_from_forms(
+                crawl_results.get("forms", []),
+                payloads,
+                max_samples=2
+            )
+        )
 
         # Filter out lab-only tests if not in lab mode
         if not self.args.lab:
-            filtered_tests = [test for test in all_tests if not test.get("meta", {}).get("lab_only", False)]
-            console.print(f"[yellow]Filtered out {len(all_tests) - len(filtered_tests)} lab-only tests[/yellow]")
-            all_tests = filtered_tests
+            def _not_lab_only(test: Dict[str, Any]) -> bool:
+                if test.get("meta", {}).get("lab_only", False):
+                    counts["lab_only"] += 1
+                    return False
+                return True
+
+            test_stream = filter(_not_lab_only, test_stream)
+
+        # Drop repeated requests (the same parameterized URL or the same form
+        # found on several pages) before they count towards max_tests. Form
+        # inputs are part of the key: forms posting to one action with
+        # different field sets send different requests
+        seen: set = set()
+
+        def _first_seen(test: Dict[str, Any]) -> bool:
+            payload = test.get("payload")
+            if isinstance(payload, dict):
+                payload = payload.get("payload")
+            key = (test.get("method"), test.get("url"), test.get("param"), payload,
+                   tuple(test.get("form_inputs", ())))
+            if key in seen:
+                counts["duplicate"] += 1
+                return False
+            seen.add(key)
+            return True
+
+        test_stream = filter(_first_seen, test_stream)
 
-        # Limit total number of tests
-        if len(all_tests) > self.args.max_tests:
-            console.print(f"[yellow]Limiting tests from {len(all_tests)} to {self.args.max_tests}[/yellow]")
-            all_tests = all_tests[:self.args.max_tests]
+        # Limit total number of tests. Generation stops at the limit (one
+        # extra candidate only detects truncation), so the filter counts
+        # below cover the candidates looked at, not every possible test
+        all_tests = list(islice(test_stream, self.args.max_tests))
+        truncated = next(test_stream, None) is not None
+        if truncated:
+            console.print(f"[yellow]Reached max_tests ({self.args.max_tests}); remaining candidates were not generated[/yellow]")
 
+        if not self.args.lab:
+            console.print(f"[yellow]Filtered out {counts['lab_only']} lab-only tests[/yellow]")
+        if counts["duplicate"]:
+            console.print(f"[yellow]Skipped {counts['duplicate']} duplicate tests[/yellow]")
+
+        # Per-origin counts of the selected tests
+        selected = Counter(test.get("origin") for test in all_tests)
         console.print(f"[green]Generated {len(all_tests)} test cases[/green]")
-        console.print(f"[blue]  - {len(param_tests)} parameter tests[/blue]")
-        console.print(f"[blue]  - {len(form_tests)} form tests[/blue]")
+        console.print(f"[blue]  - {selected['param']} parameter tests[/blue]")
+        console.print(f"[blue]  - {selected['form']} form tests[/blue]")
 
         return all_tests
 
-    async def run_tests(self, test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def analyze(self, test_case: Dict[str, Any],
+                      response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Analyze a response, in a worker process when the body is large.
+
+        Scanning a multi-megabyte body would otherwise stall the event loop
+        and every in-flight request with it.
+
+        Args:
+            test_case: Test case dictionary
+            response: HTTP response dictionary
+
+        Returns:
+            Finding dictionary or None
+        """
+        # Sized by the part of the body the pattern scans read
+        scanned = len(response.get("body") or "")
+        if self.scanner.scan_limit is not None:
+            scanned = min(scanned, self.scanner.scan_limit)
+
+        if self._use_analyze_pool and scanned >= ANALYZE_POOL_MIN_BODY:
+            loop = asyncio.get_running_loop()
+            fields = {key: test_case[key] for key in _ANALYZE_FIELDS if key in test_case}
+            try:
+                return await loop.run_in_executor(
+                    _get_analyze_pool(), _analyze_in_worker,
+                    self.scanner.fast, self.scanner.scan_limit, fields, response
+                )
+            except (OSError, BrokenProcessPool) as e:
+                # A crashed worker breaks the whole pool; replace it on next
+                # use. A pool that cannot start is not retried
+                _shutdown_analyze_pool()
+                if isinstance(e, OSError):
+                    self._use_analyze_pool = False
+                if not self._analyze_pool_warned:
+                    self._analyze_pool_warned = True
+                    console.print(f"[yellow]Analysis pool unavailable, analyzing inline: {e}[/yellow]")
+
+        return self.scanner.analyze_response(test_case, response)
+
+    async def run_tests(self, test_cases: List[Dict[str, Any]],
+                        session: Optional[aiohttp.ClientSession] = None) -> List[Dict[str, Any]]:
         """
         Execute test cases and collect findings.
 
         Args:
             test_cases: List of test case dictionaries
+            session: Shared HTTP session; one is opened for the run if omitted
 
         Returns:
             List of vulnerability findings
         """
+        if session is None:
+            async with self.open_session() as own_session:
+                return await self.run_tests(test_cases, own_session)
+
         console.print(f"[blue]Executing {len(test_cases)} test cases...[/blue]")
 
+        # Shared iterator of pending test cases, drained by a fixed pool of
+        # workers; next() never awaits, so no queue copy is needed
+        pending = iter(test_cases)
+
+        # Workers share one event loop thread, so they append directly
         findings: List[Dict[str, Any]] = []
-        semaphore = asyncio.Semaphore(self.args.concurrency)
 
-        async def execute_test_case(test_case):
-            """Execute a single test case."""
-            async with semaphore:
+        total = len(test_cases)
+        # Redraw at most ~50 times regardless of the number of tests
+        batch = max(1, total // 50)
+        completed = 0
+        # Failures are tallied and reported once after the run: Rich's
+        # console.print takes a lock and renders markup, so the worker loop
+        # must not call it per test case
+        failures = 0
+        last_error: Optional[Exception] = None
+
+        async def worker(session, progress, task) -> None:
+            """Pull test cases until none are left, collecting findings."""
+            nonlocal completed, failures, last_error
+            for test_case in pending:
                 try:
-                    # Import aiohttp here to avoid import issues
-                    import aiohttp
+                    # Submit test case
+                    response = await submit_test_case(session, test_case, timeout=10)
 
-                    async with aiohttp.ClientSession(
-                        timeout=aiohttp.ClientTimeout(total=10),
-                        headers={'User-Agent': 'EthioScan/1.0 (Ethiopian Security Scanner)'}
-                    ) as session:
-                        # Submit test case
-                        response = await submit_test_case(session, test_case, timeout=10)
+                    # Analyze response with scanner
+                    finding = await self.analyze(test_case, response)
 
-                        # Analyze response with scanner
-                        finding = self.scanner.analyze_response(test_case, response)
-
-                        if finding:
-                            findings.append(finding)
-                            console.print(f"[red]Vulnerability found: {finding.get('category')} in {finding.get('param')}[/red]")
+                    if finding:
+                        findings.append(finding)
 
                 except Exception as e:
-                    console.print(f"[yellow]Test case failed: {e}[/yellow]")
+                    failures += 1
+                    last_error = e
+                finally:
+                    completed += 1
+                    if completed % batch == 0 or completed == total:
+                        progress.update(task, completed=completed)
 
         # Execute all test cases with progress bar
         with Progress(
@@ -212,19 +511,29 @@ class EthioScanOrchestrator:
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
             TaskProgressColumn(),
-            console=console
+            console=console,
+            # Skip live rendering on CI / piped output
+            disable=not console.is_terminal
         ) as progress:
-            task = progress.add_task("Executing tests...", total=len(test_cases))
-
-            # Create tasks
-            tasks = [execute_test_case(test_case) for test_case in test_cases]
+            task = progress.add_task("Executing tests...", total=total)
+
+            # Concurrency is bounded by the number of workers
+            workers = [
+                asyncio.create_task(worker(session, progress, task))
+                for _ in range(min(self.args.concurrency, total))
+            ]
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                # Only has an effect if the scan was interrupted
+                for w in workers:
+                    w.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
 
-            # Execute with progress updates
-            completed = 0
-            for coro in asyncio.as_completed(tasks):
-                await coro
-                completed += 1
-                progress.update(task, completed=completed)
+        for finding in findings:
+            console.print(f"[red]Vulnerability found: {finding.get('category')} in {finding.get('param')}[/red]")
+        if failures:
+            console.print(f"[yellow]{failures} test case(s) failed; last error: {last_error}[/yellow]")
 
         console.print(f"[green]Test execution completed![/green]")
         console.print(f"[blue]Found {len(findings)} vulnerabilities[/blue]")
@@ -243,7 +552,7 @@ class EthioScanOrchestrator:
 
         scan_info = {
             "target_url": self.args.url,
-            "scan_time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "scan_time": self.scan_started_at,
             "depth": self.args.depth,
             "concurrency": self.args.concurrency,
             "max_tests": self.args.max_tests,
@@ -251,79 +560,68 @@ class EthioScanOrchestrator:
             "total_findings": len(findings)
         }
 
-        findings_data = {
-            "scan_info": scan_info,
-            "findings": findings
-        }
+        # Normalize severities once so readers can skip per-render lowercasing
+        for finding in findings:
+            finding["severity"] = finding.get("severity", "unknown").lower()
 
-        # Write JSON file
-        with open(self.args.out, 'w', encoding='utf-8') as f:
-            json.dump(findings_data, f, indent=2, ensure_ascii=False)
+        # Write JSON file, encoding one finding at a time
+        with open(self.args.out, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            _write_findings_json(f, scan_info, map(_encode_finding, findings))
 
         console.print(f"[green]Findings saved to {self.args.out}[/green]")
 
         # Return scan_info for DB saving / reporting
         return scan_info
 
-    def create_summary(self, findings: List[Dict[str, Any]]) -> None:
+    def create_summary(self, findings: List[Dict[str, Any]]) -> Counter:
         """
         Create a human-readable summary of findings.
 
         Args:
             findings: List of vulnerability findings
+
+        Returns:
+            Severity counts, for reuse by print_final_summary
         """
         console.print("[blue]Creating summary...[/blue]")
 
         # Count findings by severity and category
-        severity_counts: Dict[str, int] = {}
-        category_counts: Dict[str, int] = {}
-
-        for finding in findings:
-            severity = finding.get("severity", "unknown")
-            category = finding.get("category", "unknown")
-
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
-            category_counts[category] = category_counts.get(category, 0) + 1
-
-        # Create summary text
-        summary_lines = [
-            "EthioScan Vulnerability Assessment Summary",
-            "=" * 50,
-            f"Target URL: {self.args.url}",
-            f"Scan Time: {time.strftime('%Y-%m-%d %H:%M:%S')}",
-            f"Total Findings: {len(findings)}",
-            "",
-            "Findings by Severity:",
-            "-" * 20
-        ]
-
-        for severity in ["critical", "high", "medium", "low"]:
-            count = severity_counts.get(severity, 0)
-            summary_lines.append(f"{severity.capitalize()}: {count}")
-
-        summary_lines.extend([
-            "",
-            "Findings by Category:",
-            "-" * 20
-        ])
-
-        for category, count in sorted(category_counts.items()):
-            summary_lines.append(f"{category.upper()}: {count}")
-
-        if findings:
-            summary_lines.extend([
-                "",
-                "Top Vulnerabilities:",
-                "-" * 20
-            ])
-
-            # Show top 5 findings
-            for i, finding in enumerate(findings[:5], 1):
-                summary_lines.append(
-                    f"{i}. {finding.get('category','').upper()} - {finding.get('severity','')} - {finding.get('param','')} - {finding.get('url','')}"
-                )
-
-        summary_text = "\n".join(summary_lines)
+        severity_counts = Counter(finding.get("severity", "unknown") for finding in findings)
+        category_counts = Counter(finding.get("category", "unknown") for finding in findings)
+
+        def _summary_lines():
+            """Yield summary lines in report order."""
+            yield "EthioScan Vulnerability Assessment Summary"
+            yield "=" * 50
+            yield f"Target URL: {self.args.url}"
+            yield f"Scan Time: {self.scan_started_at}"
+            yield f"Total Findings: {len(findings)}"
+            yield ""
+            yield "Findings by Severity:"
+            yield "-" * 20
+
+            for severity in _SEVERITY_ORDER:
+                yield f"{severity.capitalize()}: {severity_counts.get(severity, 0)}"
+
+            yield ""
+            yield "Findings by Category:"
+            yield "-" * 20
+
+            # Most frequent categories first
+            for category, count in category_counts.most_common():
+                yield f"{category.upper()}: {count}"
+
+            if findings:
+                yield ""
+                yield "Top Vulnerabilities:"
+                yield "-" * 20
+
+                # Show top 5 findings
+                for i, finding in enumerate(findings[:5], 1):
+                    yield f"{i}. {finding.get('category','').upper()} - {finding.get('severity','')} - {finding.get('param','')} - {finding.get('url','')}"
+
+        # Create summary text in a single join
+        summary_text = "\n".join(_summary_lines())
 
         # Save summary
         summary_file = "examples/sample_summary.txt"
@@ -334,12 +632,16 @@ class EthioScanOrchestrator:
 
         console.print(f"[green]Summary saved to {summary_file}[/green]")
 
-    def print_final_summary(self, findings: List[Dict[str, Any]]) -> None:
+        return severity_counts
+
+    def print_final_summary(self, findings: List[Dict[str, Any]],
+                            severity_counts: Optional[Counter] = None) -> None:
         """
         Print final summary to console.
 
         Args:
             findings: List of vulnerability findings
+            severity_counts: Severity counts from create_summary (recomputed if omitted)
         """
         console.print("\n[bold green]EthioScan Assessment Complete![/bold green]")
         console.print("=" * 50)
@@ -347,16 +649,14 @@ class EthioScanOrchestrator:
         console.print(f"Total Findings: {len(findings)}")
 
         if findings:
-            severity_counts: Dict[str, int] = {}
-            for finding in findings:
-                severity = finding.get("severity", "unknown")
-                severity_counts[severity] = severity_counts.get(severity, 0) + 1
+            if severity_counts is None:
+                severity_counts = Counter(finding.get("severity", "unknown") for finding in findings)
 
             console.print("\n[bold]Findings by Severity:[/bold]")
-            for severity in ["critical", "high", "medium", "low"]:
+            for severity in _SEVERITY_ORDER:
                 count = severity_counts.get(severity, 0)
                 if count > 0:
-                    color = "red" if severity in ["critical", "high"] else "yellow" if severity == "medium" else "blue"
+                    color = _SEVERITY_COLORS.get(severity, "blue")
                     console.print(f"  [{color}]{severity.capitalize()}: {count}[/{color}]")
         else:
             console.print("\n[green]No vulnerabilities found![/green]")
@@ -365,44 +665,52 @@ class EthioScanOrchestrator:
         console.print(f"  - {self.args.out}")
         console.print(f"  - examples/sample_summary.txt")
 
-    async def run(self) -> None:
+    async def run(self) -> int:
         """
         Run the complete EthioScan assessment.
+
+        Returns:
+            Process exit status (0 on success, 1 on failure)
         """
         start_time = time.time()
+        self.scan_started_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(start_time))
 
         try:
             # Check allowlist
             if not self.check_allowlist():
-                sys.exit(1)
+                return 1
 
-            # Run crawler
-            crawl_results = await self.run_crawler()
+            # One session (connection pool, DNS cache) for crawl and tests
+            async with self.open_session() as session:
+                # Run crawler
+                crawl_results = await self.run_crawler(session)
 
-            # Generate test cases
-            test_cases = self.generate_test_cases(crawl_results)
+                # Generate test cases
+                test_cases = self.generate_test_cases(crawl_results)
 
-            if not test_cases:
-                console.print("[yellow]No test cases generated. Nothing to scan.[/yellow]")
-                scan_info = self.save_findings([])
-                self.create_summary([])
-                self.print_final_summary([])
-                return
+                if not test_cases:
+                    console.print("[yellow]No test cases generated. Nothing to scan.[/yellow]")
+                    scan_info = self.save_findings([])
+                    severity_counts = self.create_summary([])
+                    self.print_final_summary([], severity_counts)
+                    return 0
 
-            # Run tests
-            findings = await self.run_tests(test_cases)
+                # Run tests
+                findings = await self.run_tests(test_cases, session)
 
             # Save results (and get scan_info)
             scan_info = self.save_findings(findings)
-            self.create_summary(findings)
+            severity_counts = self.create_summary(findings)
 
             # Optional: Save to SQLite DB if requested
             if getattr(self.args, "save_db", False):
                 try:
                     from ethioscan import db
-                    db.initialize_db()
-                    scan_id = db.save_scan(scan_info)
-                    db.save_findings(scan_id, findings)
+                    # Schema, scan row and findings in a single transaction
+                    with db.transaction() as conn:
+                        db.initialize_db(conn)
+                        scan_id = db.save_scan(scan_info, conn)
+                        db.save_findings(scan_id, findings, conn)
                     console.print(f"[green]Saved scan to database (scan_id={scan_id})[/green]")
                 except Exception as e:
                     console.print(f"[yellow]Warning: failed to save to DB: {e}[/yellow]")
@@ -419,14 +727,17 @@ class EthioScanOrchestrator:
             # Print final summary
             elapsed = time.time() - start_time
             console.print(f"\n[blue]Total scan time: {elapsed:.1f} seconds[/blue]")
-            self.print_final_summary(findings)
+            self.print_final_summary(findings, severity_counts)
+            return 0
 
         except KeyboardInterrupt:
             console.print("\n[yellow]Scan interrupted by user[/yellow]")
-            sys.exit(1)
+            return 1
         except Exception as e:
             console.print(f"\n[red]Scan failed: {e}[/red]")
-            sys.exit(1)
+            return 1
+        finally:
+            _shutdown_analyze_pool(wait=True)
 
 
 def parse_args():
@@ -473,6 +784,14 @@ Safety Notice:
         help='Maximum number of test cases to generate (default: 200)'
     )
 
+    parser.add_argument(
+        '--scan-limit',
+        dest='scan_limit',
+        type=int,
+        default=DEFAULT_SCAN_LIMIT,
+        help='Leading response characters run through keyword/pattern detection; 0 scans whole bodies (default: 262144)'
+    )
+
     parser.add_argument(
         '--out',
         default='examples/sample_findings.json',
@@ -508,8 +827,13 @@ Safety Notice:
     return parser.parse_args()
 
 
-async def main():
-    """Main entry point."""
+async def main() -> int:
+    """
+    Main entry point.
+
+    Returns:
+        Process exit status
+    """
     args = parse_args()
 
     # Print banner
@@ -519,8 +843,18 @@ async def main():
 
     # Create and run orchestrator
     orchestrator = EthioScanOrchestrator(args)
-    await orchestrator.run()
+    return await orchestrator.run()
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    # Use uvloop's faster event loop when it is installed (optional;
+    # uvloop only supports Linux and macOS)
+    if sys.platform != 'win32':
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
+
+    # Exit after the event loop has shut down, not from inside it
+    sys.exit(asyncio.run(main()))
@@ -3,57 +3,203 @@ EthioScan Scanner - Vulnerability detection and analysis
 """
 
 import re
+import time
 import uuid
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # optional, single-pass keyword matching
+    ahocorasick = None
+
+
+# Payloads come from a small fixed set, so their lowercase forms are
+# memoized instead of being rebuilt for every analyzed response
+_lower_payload = lru_cache(maxsize=512)(str.lower)
+
+# Number of distinct response bodies whose detection verdicts are remembered
+BODY_CACHE_SIZE = 1024
+
+# Default number of leading body characters run through the keyword and XSS
+# pattern scans, bounding their cost on multi-megabyte responses. Payload
+# reflection and evidence are a single find and always use the whole body
+DEFAULT_SCAN_LIMIT = 256 * 1024
+
+# (epoch second, formatted date/time prefix) for _get_timestamp; findings
+# arrive in bursts, so the date part is formatted once per second
+_timestamp_cache: Tuple[int, str] = (-1, "")
+
+# Database error keywords for SQL injection detection
+SQLI_KEYWORDS = (
+    "syntax error", "mysql", "ora-00933", "postgres", "sqlstate",
+    "sql syntax", "database error", "sql error", "query failed",
+    "mysql_fetch", "postgresql", "oracle", "sqlite", "mssql",
+    "sql server", "access denied", "invalid query", "sql exception",
+    "database connection", "sql command", "sqlite3", "mysqli",
+    "pg_query", "oci_parse", "sqlite_error", "mssql_query"
+)
+
+# XSS payload patterns for reflected XSS detection. Response bodies are
+# attacker-controlled, so every pattern must match in linear time: tag
+# attributes stop at the next "<" and the script body is an unrolled loop
+# that cannot run past another "<script", which keeps backtracking local.
+# Like the original non-DOTALL ".*?", the script body never spans a
+# newline, so ordinary multi-line inline scripts are not flagged
+XSS_PATTERNS = (
+    r"<script[^<>]*>[^<\n]*(?:<(?!/script>|script)[^<\n]*)*</script>",
+    r"<img[^<>]*onerror[^<>]*>",
+    r"<svg[^<>]*onload[^<>]*>",
+    r"<iframe[^<>]*src\s*=\s*[\"']?\s*javascript:",
+    r"<body[^<>]*onload[^<>]*>",
+    r"<input[^<>]*onfocus[^<>]*>",
+    r"<select[^<>]*onfocus[^<>]*>",
+    r"javascript:",
+    r"onclick\s*=",
+    r"onmouseover\s*=",
+    r"onerror\s*=",
+    r"onload\s*="
+)
+
+# Error keywords for general error detection
+ERROR_KEYWORDS = (
+    "error", "exception", "warning", "fatal", "critical",
+    "failed", "failure", "invalid", "unauthorized", "forbidden",
+    "not found", "internal server error", "bad request",
+    "service unavailable", "timeout", "connection refused"
+)
+
+# Content-Type prefixes of responses worth scanning; images, PDFs, fonts
+# and other binary assets cannot carry a detectable error or reflection
+_TEXT_CONTENT_TYPES = (
+    "text/", "application/json", "application/xml", "application/javascript",
+    "application/xhtml"
+)
+
+# Status codes and Server header keywords flagged by _detect_anomalies
+_ANOMALY_STATUSES = frozenset((500, 502, 503, 504))
+_SERVER_ANOMALY_KEYWORDS = ("error", "debug", "test")
+
+
+@lru_cache(maxsize=256)
+def _is_text_content_type(content_type: str) -> bool:
+    """
+    Check whether a Content-Type header value denotes a textual body.
+    
+    Args:
+        content_type: Content-Type header value
+        
+    Returns:
+        True if the body is text (including +json/+xml types)
+    """
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith(_TEXT_CONTENT_TYPES) or media_type.endswith(("+json", "+xml"))
+
+
+def _is_scannable(response: Dict) -> bool:
+    """
+    Check whether a response has a body worth scanning.
+    
+    Args:
+        response: Response dictionary
+        
+    Returns:
+        True if the body is non-empty and not declared as binary; a missing
+        Content-Type is treated as text
+    """
+    if not response or not response.get("body"):
+        return False
+    
+    # Header names keep the server's casing (e.g. PHP's "Content-type")
+    headers = response.get("headers") or {}
+    content_type = next((value for name, value in headers.items() if name.lower() == "content-type"), None)
+    return not content_type or _is_text_content_type(content_type)
+
+
+@lru_cache(maxsize=None)
+def _compile_alternation(patterns: Tuple[str, ...]) -> "re.Pattern":
+    """
+    Compile patterns into one alternation, shared by all Scanner instances.
+    
+    Args:
+        patterns: Tuple of regex patterns
+        
+    Returns:
+        Compiled alternation pattern
+    """
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+
+@lru_cache(maxsize=None)
+def _build_keyword_automaton(sqli_keywords: Tuple[str, ...], error_keywords: Tuple[str, ...]):
+    """
+    Build an Aho-Corasick automaton mapping each keyword to its categories.
+    
+    Built once per keyword set and shared by all Scanner instances.
+    
+    Args:
+        sqli_keywords: SQL injection keywords
+        error_keywords: General error keywords
+        
+    Returns:
+        Automaton, or None if pyahocorasick is not installed
+    """
+    if ahocorasick is None:
+        return None
+    
+    categories: Dict[str, List[str]] = {}
+    for category, keywords in (("sqli", sqli_keywords), ("error", error_keywords)):
+        for keyword in keywords:
+            categories.setdefault(keyword, []).append(category)
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, keyword_categories in categories.items():
+        automaton.add_word(keyword, tuple(keyword_categories))
+    automaton.make_automaton()
+    return automaton
 
 
 class Scanner:
     """
     Vulnerability scanner for analyzing HTTP responses and detecting security issues.
     """
+
+    # Tokens that mark a payload as an XSS probe, compiled into one
+    # alternation so a payload is scanned once instead of once per token
+    _XSS_INDICATOR_RE = re.compile("|".join(re.escape(indicator) for indicator in (
+        "<script", "<img", "<svg", "<iframe", "<body", "<input", "<select",
+        "javascript:", "onclick", "onmouseover", "onerror", "onload", "onfocus"
+    )))
     
-    def __init__(self, fast: bool = False):
+    def __init__(self, fast: bool = False, scan_limit: Optional[int] = DEFAULT_SCAN_LIMIT):
         """
         Initialize the scanner.
         
         Args:
-            fast: If True, skips heavy checks for faster scanning
+            fast: If True, skips the XSS pattern regexes; SQL/error keyword
+                matching, payload reflection and anomaly checks still run
+            scan_limit: Number of leading body characters run through the
+                keyword and XSS pattern scans, or None to scan whole bodies
         """
         self.fast = fast
+        self.scan_limit = scan_limit
         
-        # Database error keywords for SQL injection detection
-        self.sqli_keywords = [
-            "syntax error", "mysql", "ora-00933", "postgres", "sqlstate",
-            "sql syntax", "database error", "sql error", "query failed",
-            "mysql_fetch", "postgresql", "oracle", "sqlite", "mssql",
-            "sql server", "access denied", "invalid query", "sql exception",
-            "database connection", "sql command", "sqlite3", "mysqli",
-            "pg_query", "oci_parse", "sqlite_error", "mssql_query"
-        ]
-        
-        # XSS payload patterns for reflected XSS detection
-        self.xss_patterns = [
-            r"<script[^>]*>.*?</script>",
-            r"<img[^>]*onerror[^>]*>",
-            r"<svg[^>]*onload[^>]*>",
-            r"<iframe[^>]*src[^>]*javascript:",
-            r"<body[^>]*onload[^>]*>",
-            r"<input[^>]*onfocus[^>]*>",
-            r"<select[^>]*onfocus[^>]*>",
-            r"javascript:",
-            r"onclick\s*=",
-            r"onmouseover\s*=",
-            r"onerror\s*=",
-            r"onload\s*="
-        ]
-        
-        # Error keywords for general error detection
-        self.error_keywords = [
-            "error", "exception", "warning", "fatal", "critical",
-            "failed", "failure", "invalid", "unauthorized", "forbidden",
-            "not found", "internal server error", "bad request",
-            "service unavailable", "timeout", "connection refused"
-        ]
+        # Detection tables are shared module-level tuples, not per-instance lists
+        self.sqli_keywords = SQLI_KEYWORDS
+        self.xss_patterns = XSS_PATTERNS
+        self.error_keywords = ERROR_KEYWORDS
+
+        # All XSS patterns as one alternation, scanned in a single pass. The
+        # body is already lowercased, so no IGNORECASE (which is much slower)
+        self._xss_re = _compile_alternation(self.xss_patterns)
+
+        # One automaton over all keyword lists (None without pyahocorasick)
+        self._keyword_automaton = _build_keyword_automaton(self.sqli_keywords, self.error_keywords)
+
+        # Body hash -> (sqli, xss pattern, error) verdicts, LRU-bounded.
+        # Fuzzing often yields many identical bodies (404s, error pages)
+        self._body_verdicts: "OrderedDict[int, Tuple[bool, Optional[bool], bool]]" = OrderedDict()
     
     def analyze_response(self, test_case: Dict, response: Dict) -> Optional[Dict]:
         """
@@ -66,35 +212,66 @@ class Scanner:
         Returns:
             Finding dictionary if vulnerability detected, None otherwise
         """
-        if not response or not response.get("body"):
+        # Empty and binary bodies are dismissed before any lowercasing
+        if not _is_scannable(response):
             return None
         
         response_body = response["body"].lower()
-        payload = test_case.get("payload", {})
+        payload_str = self._payload_str(test_case)
         
-        # Extract payload string for reflection checking
-        payload_str = ""
+        return self._classify(test_case, response, response_body, payload_str)
+    
+    def _payload_str(self, test_case: Dict) -> str:
+        """
+        Extract the lowercase payload string used for reflection checking.
+        
+        Args:
+            test_case: Test case dictionary
+            
+        Returns:
+            Lowercase payload string, or "" if none
+        """
+        payload = test_case.get("payload", {})
         if isinstance(payload, dict) and "payload" in payload:
-            payload_str = payload["payload"].lower()
-        elif isinstance(payload, str):
-            payload_str = payload.lower()
+            return _lower_payload(payload["payload"])
+        if isinstance(payload, str):
+            return _lower_payload(payload)
+        return ""
+    
+    def _classify(self, test_case: Dict, response: Dict, response_body: str,
+                  payload_str: str) -> Optional[Dict]:
+        """
+        Run the detectors in priority order and build a finding for the first hit.
         
+        Args:
+            test_case: Test case dictionary
+            response: Response dictionary
+            response_body: Lowercase response body text
+            payload_str: Lowercase payload string
+            
+        Returns:
+            Finding dictionary if vulnerability detected, None otherwise
+        """
+        # Body-only keyword detections, reused for bodies seen before
+        sqli_hit, _, error_hit = self._body_verdict(response_body)
+
         # Check for SQL injection
-        if self.detect_sqli(response_body):
+        if sqli_hit:
             return self._create_finding(
                 test_case, response, "sqli", "high",
                 self._extract_evidence(response_body, payload_str)
             )
         
-        # Check for XSS
-        if self.detect_xss(response_body, payload_str):
+        # Check for XSS: verbatim reflection is a single substring search, so
+        # it runs first and a reflected payload never pays for the patterns
+        if self._is_xss_reflected(response_body, payload_str) or self._xss_pattern_hit(response_body):
             return self._create_finding(
                 test_case, response, "xss", "high",
                 self._extract_evidence(response_body, payload_str)
             )
         
         # Check for general errors
-        if self.detect_error_keywords(response_body):
+        if error_hit:
             return self._create_finding(
                 test_case, response, "error", "medium",
                 self._extract_evidence(response_body, payload_str)
@@ -109,6 +286,99 @@ class Scanner:
         
         return None
     
+    def _body_verdict(self, response_body: str) -> Tuple[bool, Optional[bool], bool]:
+        """
+        Run the body-only detectors, caching results by body hash.
+        
+        Args:
+            response_body: Lowercase response body text
+            
+        Returns:
+            Tuple of (sqli keyword hit, xss pattern hit, error keyword hit);
+            the XSS pattern hit is None until _xss_pattern_hit computes it,
+            and False in fast mode or when SQLi already hit
+        """
+        key = hash(response_body)
+        verdict = self._body_verdicts.get(key)
+        if verdict is not None:
+            self._body_verdicts.move_to_end(key)
+            return verdict
+        
+        # SQLi outranks every other finding and depends only on the body, so
+        # a SQLi hit makes the (much costlier) XSS pattern scan pointless.
+        # Slicing a body shorter than the limit returns it without a copy
+        keyword_hits = self._keyword_hits(response_body[:self.scan_limit])
+        sqli_hit = "sqli" in keyword_hits
+        verdict = (
+            sqli_hit,
+            False if self.fast or sqli_hit else None,
+            "error" in keyword_hits
+        )
+        
+        self._body_verdicts[key] = verdict
+        if len(self._body_verdicts) > BODY_CACHE_SIZE:
+            self._body_verdicts.popitem(last=False)
+        
+        return verdict
+    
+    def _xss_pattern_hit(self, response_body: str) -> bool:
+        """
+        Run the XSS pattern scan on demand, caching it in the body verdict.
+        
+        Args:
+            response_body: Lowercase response body text
+            
+        Returns:
+            True if any XSS pattern matches (always False in fast mode)
+        """
+        sqli_hit, xss_hit, error_hit = self._body_verdict(response_body)
+        if xss_hit is None:
+            end = len(response_body) if self.scan_limit is None else self.scan_limit
+            xss_hit = self._xss_re.search(response_body, 0, end) is not None
+            key = hash(response_body)
+            if key in self._body_verdicts:
+                self._body_verdicts[key] = (sqli_hit, xss_hit, error_hit)
+        return xss_hit
+    
+    def _keyword_hits(self, response_body: str) -> Set[str]:
+        """
+        Find which keyword categories ("sqli", "error") occur in the body.
+        
+        Args:
+            response_body: Lowercase response body text
+            
+        Returns:
+            Set of matched category names
+        """
+        if self._keyword_automaton is None:
+            hits = set()
+            if self.detect_sqli(response_body):
+                hits.add("sqli")
+            if self.detect_error_keywords(response_body):
+                hits.add("error")
+            return hits
+        
+        hits = set()
+        for _, categories in self._keyword_automaton.iter(response_body):
+            hits.update(categories)
+        return hits
+    
+    def _automaton_finds(self, response_body: str, category: str) -> bool:
+        """
+        Check whether any keyword of one category occurs, stopping at the first.
+        
+        Args:
+            response_body: Lowercase response body text
+            category: Keyword category ("sqli" or "error")
+            
+        Returns:
+            True if a keyword of the category is found
+        """
+        for _, categories in self._keyword_automaton.iter(response_body):
+            if category in categories:
+                return True
+        return False
+    
     def detect_sqli(self, response_body: str) -> bool:
         """
         Detect SQL injection vulnerabilities in response body.
@@ -119,10 +389,12 @@ class Scanner:
         Returns:
             True if SQL injection indicators found
         """
-        for keyword in self.sqli_keywords:
-            if keyword in response_body:
-                return True
-        return False
+        if self._keyword_automaton is not None:
+            return self._automaton_finds(response_body, "sqli")
+        
+        # Substring checks beat a re alternation, which retries every branch
+        # at each position
+        return any(keyword in response_body for keyword in self.sqli_keywords)
     
     def detect_xss(self, response_body: str, payload_str: str = "") -> bool:
         """
@@ -135,11 +407,24 @@ class Scanner:
         Returns:
             True if XSS indicators found
         """
-        # Check for XSS patterns first (more reliable)
-        for pattern in self.xss_patterns:
-            if re.search(pattern, response_body, re.IGNORECASE):
-                return True
+        # Verbatim reflection is the common positive and a single substring
+        # search, so it runs before the pattern scan
+        if self._is_xss_reflected(response_body, payload_str):
+            return True
         
+        return self._xss_re.search(response_body) is not None
+    
+    def _is_xss_reflected(self, response_body: str, payload_str: str) -> bool:
+        """
+        Check whether an XSS payload is reflected verbatim in the body.
+        
+        Args:
+            response_body: Lowercase response body text
+            payload_str: Lowercase payload string
+            
+        Returns:
+            True if the payload contains XSS indicators and is reflected
+        """
         # Check for payload reflection only if payload contains XSS indicators
         if payload_str and self._is_xss_payload(payload_str):
             if payload_str in response_body:
@@ -152,18 +437,12 @@ class Scanner:
         Check if a payload string contains XSS indicators.
         
         Args:
-            payload_str: Payload string to check
+            payload_str: Lowercase payload string to check
             
         Returns:
             True if payload contains XSS indicators
         """
-        xss_indicators = [
-            "<script", "<img", "<svg", "<iframe", "<body", "<input", "<select",
-            "javascript:", "onclick", "onmouseover", "onerror", "onload", "onfocus"
-        ]
-        
-        payload_lower = payload_str.lower()
-        return any(indicator in payload_lower for indicator in xss_indicators)
+        return self._XSS_INDICATOR_RE.search(payload_str) is not None
     
     def detect_error_keywords(self, response_body: str) -> bool:
         """
@@ -175,10 +454,10 @@ class Scanner:
         Returns:
             True if error keywords found
         """
-        for keyword in self.error_keywords:
-            if keyword in response_body:
-                return True
-        return False
+        if self._keyword_automaton is not None:
+            return self._automaton_finds(response_body, "error")
+        
+        return any(keyword in response_body for keyword in self.error_keywords)
     
     def _detect_anomalies(self, response: Dict, payload_str: str) -> bool:
         """
@@ -192,20 +471,20 @@ class Scanner:
             True if anomalies detected
         """
         # Check for unusual status codes
-        status = response.get("status", 0)
-        if status in [500, 502, 503, 504]:
+        if response.get("status", 0) in _ANOMALY_STATUSES:
             return True
         
-        # Check for unusual response times (if available)
-        elapsed = response.get("elapsed", 0)
+        # Check for unusual response times (if available); a missing or None
+        # elapsed counts as 0 so the comparison needs no type check
+        elapsed = response.get("elapsed") or 0
         if elapsed > 10:  # Very slow response might indicate processing issues
             return True
         
         # Check for unusual headers
-        headers = response.get("headers", {})
-        if "server" in headers:
-            server = headers["server"].lower()
-            if any(keyword in server for keyword in ["error", "debug", "test"]):
+        server = response.get("headers", {}).get("server")
+        if server:
+            server = server.lower()
+            if any(keyword in server for keyword in _SERVER_ANOMALY_KEYWORDS):
                 return True
         
         return False
@@ -225,8 +504,14 @@ class Scanner:
         Returns:
             Finding dictionary
         """
+        # Only mint an id when the test case lacks one; a default argument
+        # to get() would generate a UUID on every call
+        finding_id = test_case.get("id")
+        if finding_id is None:
+            finding_id = str(uuid.uuid4())
+        
         return {
-            "id": test_case.get("id", str(uuid.uuid4())),
+            "id": finding_id,
             "category": category,
             "param": test_case.get("param", ""),
             "url": test_case.get("url", ""),
@@ -255,20 +540,19 @@ class Scanner:
         if not response_body:
             return ""
         
-        # If payload is reflected, try to extract context around it
-        if payload_str and payload_str in response_body:
-            start = response_body.find(payload_str)
-            if start != -1:
-                # Extract context around the payload
-                context_start = max(0, start - 100)
-                context_end = min(len(response_body), start + len(payload_str) + 100)
-                evidence = response_body[context_start:context_end]
-                
-                # Truncate if too long
-                if len(evidence) > max_length:
-                    evidence = evidence[:max_length] + "..."
-                
-                return evidence
+        # If payload is reflected, extract context around it (a single find
+        # both tests for reflection and locates it)
+        start = response_body.find(payload_str) if payload_str else -1
+        if start != -1:
+            context_start = max(0, start - 100)
+            context_end = min(len(response_body), start + len(payload_str) + 100)
+            evidence = response_body[context_start:context_end]
+            
+            # Truncate if too long
+            if len(evidence) > max_length:
+                evidence = evidence[:max_length] + "..."
+            
+            return evidence
         
         # Otherwise, return beginning of response
         if len(response_body) > max_length:
@@ -281,10 +565,16 @@ class Scanner:
         Get current timestamp string.
         
         Returns:
-            ISO timestamp string
+            Local ISO timestamp string with microseconds
         """
-        from datetime import datetime
-        return datetime.now().isoformat()
+        global _timestamp_cache
+        now = time.time()
+        second = int(now)
+        cached_second, prefix = _timestamp_cache
+        if second != cached_second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second))
+            _timestamp_cache = (second, prefix)
+        return f"{prefix}.{int((now - second) * 1e6):06d}"
     
     def get_detection_stats(self) -> Dict[str, int]:
         """
@@ -151,6 +151,26 @@ class TestParseHtml:
         ]
         assert set(param_urls) == set(expected_param_urls)
         
+    def test_parse_matches_without_lxml(self):
+        """Test the lxml and BeautifulSoup parsing paths agree"""
+        import crawler
+        
+        if crawler.lxml_html is None:
+            pytest.skip("lxml not installed")
+        
+        fixture_path = os.path.join(os.path.dirname(__file__), 'fixtures', 'test_page.html')
+        with open(fixture_path, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        
+        base_url = "https://example.com/test"
+        with_lxml = parse_html(html_content, base_url)
+        with patch.object(crawler, 'lxml_html', None):
+            without_lxml = parse_html(html_content, base_url)
+        
+        assert with_lxml[0] == without_lxml[0]
+        assert with_lxml[1] == without_lxml[1]
+        assert sorted(p['url'] for p in with_lxml[2]) == sorted(p['url'] for p in without_lxml[2])
+        
     def test_parse_empty_html(self):
         """Test parsing empty HTML"""
         html = "<html><body></body></html>"
@@ -265,6 +285,52 @@ class TestCrawlIntegration:
             # Should not have pages at depth 2
             assert "https://example.com/page3" not in result['pages']
             assert "https://example.com/page4" not in result['pages']
+    
+    @pytest.mark.asyncio
+    async def test_parse_pages_in_pool(self):
+        """Test pooled parsing of a large level matches inline parsing"""
+        from crawler import _parse_pages, PARSE_POOL_MIN_PAGES
+        
+        pages = [
+            (f'<html><body><a href="/page{i}?id={i}">Page</a></body></html>', f"https://example.com/p{i}")
+            for i in range(PARSE_POOL_MIN_PAGES)
+        ]
+        
+        results = await _parse_pages(pages)
+        
+        assert results == [parse_html(html, url) for html, url in pages]
+    
+    @pytest.mark.asyncio
+    async def test_parse_pages_recovers_from_crashed_worker(self):
+        """Test pages lost to a crashed parse worker are re-parsed inline"""
+        import crawler
+        from concurrent.futures import Executor, Future
+        from concurrent.futures.process import BrokenProcessPool
+        
+        class CrashingPool(Executor):
+            """Runs the first page, then fails like a pool whose worker died"""
+            def __init__(self):
+                self.submitted = 0
+            
+            def submit(self, fn, *args):
+                future = Future()
+                if self.submitted:
+                    future.set_exception(BrokenProcessPool("worker died"))
+                else:
+                    future.set_result(fn(*args))
+                self.submitted += 1
+                return future
+        
+        pages = [
+            (f'<html><body><a href="/page{i}?id={i}">Page</a></body></html>', f"https://example.com/p{i}")
+            for i in range(crawler.PARSE_POOL_MIN_PAGES + 2)
+        ]
+        
+        with patch.object(crawler, "_parse_pool", CrashingPool()):
+            results = await crawler._parse_pages(pages)
+            assert crawler._parse_pool is None
+        
+        assert results == [parse_html(html, url) for html, url in pages]
 
 
 class TestCrawlSync:
@@ -272,7 +338,7 @@ class TestCrawlSync:
     
     def test_crawl_sync_basic(self):
         """Test basic synchronous crawling"""
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_response = type('MockResponse', (), {
                 'status_code': 200,
                 'text': """
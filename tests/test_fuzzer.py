@@ -2,6 +2,9 @@
 Tests for EthioScan Fuzzer and Payloads
 """
 
+import copy
+import json
+import pickle
 import pytest
 import uuid
 from unittest.mock import patch, AsyncMock
@@ -150,6 +153,32 @@ class TestFuzzer:
             assert "category" in test["meta"]
             assert "lab_only" in test["meta"]
     
+    def test_generated_tests_serializable(self):
+        """Test generated test cases can be pickled, deep-copied and exported as JSON"""
+        params = [{"url": "https://example.com/search?q=test", "params": {"q": ["test"]}}]
+        forms = [{"url": "https://example.com/", "action": "https://example.com/submit",
+                  "method": "post", "inputs": ["name"]}]
+        payloads = get_payloads("safe")
+        
+        tests = list(generate_tests_from_params(params, payloads, max_per_param=1))
+        tests += list(generate_tests_from_forms(forms, payloads, max_samples=1))
+        
+        for test in tests:
+            assert pickle.loads(pickle.dumps(test)) == test
+            assert copy.deepcopy(test) == test
+            json.dumps(test)
+    
+    def test_generated_tests_have_own_meta(self):
+        """Test updating one test case's meta leaves the others untouched"""
+        params = [{"url": "https://example.com/search?q=test&page=1", "params": {"q": ["test"], "page": ["1"]}}]
+        
+        tests = list(generate_tests_from_params(params, get_payloads("safe"), max_per_param=1))
+        sqli_tests = [test for test in tests if test["meta"]["category"] == "sqli"]
+        assert len(sqli_tests) == 2
+        
+        sqli_tests[0]["meta"]["lab_only"] = True
+        assert sqli_tests[1]["meta"]["lab_only"] == False
+    
     def test_generate_tests_from_forms(self):
         """Test test generation from forms"""
         forms = [
@@ -347,7 +376,7 @@ class TestFuzzerSync:
         }
         
         # Mock requests
-        with patch('requests.get') as mock_get:
+        with patch('requests.Session.get') as mock_get:
             mock_response = type('MockResponse', (), {
                 'status_code': 200,
                 'text': '{"args": {"test": "test_value"}}',
@@ -3,6 +3,7 @@ Tests for EthioScan Scanner
 """
 
 import pytest
+import time
 import uuid
 from scanner import Scanner
 
@@ -105,6 +106,41 @@ class TestScanner:
         for test_case in test_cases:
             assert scanner.detect_xss(test_case.lower()) == False
     
+    def test_detect_xss_pathological_input(self):
+        """Test XSS patterns stay linear on unterminated tag floods"""
+        scanner = Scanner()
+        
+        # Each of these backtracked for seconds or longer with the old patterns
+        test_cases = [
+            "<script " * 10000,
+            "<script>" * 10000,
+            "<img " * 10000,
+            "<iframe src " * 10000
+        ]
+        
+        for test_case in test_cases:
+            start = time.perf_counter()
+            assert scanner.detect_xss(test_case) == False
+            assert time.perf_counter() - start < 1.0
+    
+    def test_multiline_inline_script_not_flagged(self):
+        """Test an ordinary multi-line inline script is not reported as XSS"""
+        scanner = Scanner()
+        
+        body = (
+            "<html><head><script type=\"text/javascript\">\n"
+            "  var config = {debug: false};\n"
+            "  if (a < b) { init(config); }\n"
+            "</script></head><body>search results</body></html>"
+        )
+        response = {"status": 200, "headers": {"content-type": "text/html"}, "body": body, "elapsed": 0.1}
+        
+        assert scanner.detect_xss(body.lower()) == False
+        assert scanner.analyze_response({"payload": {"payload": "<script>alert(1)</script>"}}, response) is None
+        
+        # The same script on one line still matches, as it always did
+        assert scanner.detect_xss(body.replace("\n", " ").lower()) == True
+    
     def test_detect_error_keywords_positive(self):
         """Test error keyword detection with positive cases"""
         scanner = Scanner()
@@ -137,6 +173,154 @@ class TestScanner:
         for test_case in test_cases:
             assert scanner.detect_error_keywords(test_case.lower()) == False
     
+    def test_keyword_hits_single_pass(self):
+        """Test single-pass keyword matching gives the expected verdicts"""
+        scanner = Scanner()
+        if scanner._keyword_automaton is None:
+            pytest.skip("pyahocorasick not installed")
+        
+        # (body, expected keyword categories)
+        test_cases = [
+            ("you have an error in your sql syntax near '1'", {"sqli", "error"}),
+            ("ora-00933: sql command not properly ended", {"sqli"}),
+            ("sqlstate[42000]: access denied", {"sqli"}),
+            ("503 service unavailable", {"error"}),
+            ("internal server error occurred", {"error"}),
+            ("welcome to our website", set()),
+            ("my sequel db is fine", set()),
+            ("", set())
+        ]
+        
+        for body, expected in test_cases:
+            assert scanner._keyword_hits(body) == expected
+            assert scanner.detect_sqli(body) == ("sqli" in expected)
+            assert scanner.detect_error_keywords(body) == ("error" in expected)
+    
+    def test_keyword_hits_drive_findings(self):
+        """Test keyword verdicts map to the right finding category"""
+        scanner = Scanner()
+        test_case = {"payload": {"payload": "' OR 1=1--"}}
+        
+        test_cases = [
+            ("You have an error in your SQL syntax", "sqli"),
+            ("Service Unavailable", "error"),
+            ("Welcome to our website", None)
+        ]
+        
+        for body, expected in test_cases:
+            response = {"status": 200, "headers": {}, "body": body, "elapsed": 0.1}
+            finding = scanner.analyze_response(test_case, response)
+            assert (finding and finding["category"]) == expected
+    
+    def test_keyword_fallback_without_automaton(self):
+        """Test keyword detection without the automaton gives the expected verdicts"""
+        scanner = Scanner()
+        scanner._keyword_automaton = None
+        
+        # (body, expected keyword categories)
+        test_cases = [
+            ("you have an error in your sql syntax near '1'", {"sqli", "error"}),
+            ("ora-00933: sql command not properly ended", {"sqli"}),
+            ("warning: pg_query(): query failed", {"sqli", "error"}),
+            ("503 service unavailable", {"error"}),
+            ("welcome to our website", set()),
+            ("my sequel db is fine", set()),
+            ("", set())
+        ]
+        
+        for body, expected in test_cases:
+            assert scanner._keyword_hits(body) == expected
+            assert scanner.detect_sqli(body) == ("sqli" in expected)
+            assert scanner.detect_error_keywords(body) == ("error" in expected)
+        
+        response = {"status": 200, "headers": {}, "body": "ORA-00933: SQL command not properly ended", "elapsed": 0.1}
+        assert scanner.analyze_response({"payload": {"payload": "'"}}, response)["category"] == "sqli"
+    
+    def test_shared_patterns_detect_in_every_instance(self):
+        """Test scanners built from the shared tables all detect the same inputs"""
+        scanners = [Scanner(), Scanner(), Scanner(fast=True)]
+        
+        for scanner in scanners:
+            assert scanner.detect_sqli("mysql_fetch_array() expects parameter 1") == True
+            assert scanner.detect_sqli("hello world") == False
+            assert scanner.detect_error_keywords("fatal: request failed") == True
+            assert scanner.detect_error_keywords("all good") == False
+        
+        for scanner in scanners[:2]:
+            assert scanner.detect_xss("<img src=x onerror=alert(1)>") == True
+            assert scanner.detect_xss("<img src=x alt=photo>") == False
+    
+    def test_body_verdict_cache(self):
+        """Test identical bodies reuse cached verdicts while reflection stays per test case"""
+        scanner = Scanner()
+        
+        body = "search results for: <svg onload=alert(1)>"
+        response = {"status": 200, "headers": {}, "body": body, "elapsed": 0.1}
+        
+        first = scanner.analyze_response({"payload": {"payload": "<svg onload=alert(1)>"}}, response)
+        second = scanner.analyze_response({"payload": {"payload": "plain"}}, response)
+        
+        assert first["category"] == "xss"
+        assert second["category"] == "xss"
+        assert len(scanner._body_verdicts) == 1
+    
+    def test_sqli_hit_skips_xss_patterns(self):
+        """Test the XSS pattern scan is skipped once a body has a SQLi hit"""
+        scanner = Scanner()
+        
+        body = "you have an error in your sql syntax near '<script>alert(1)</script>'"
+        
+        assert scanner._body_verdict(body)[:2] == (True, False)
+        
+        finding = scanner.analyze_response(
+            {"payload": {"payload": "<script>alert(1)</script>"}},
+            {"status": 200, "headers": {}, "body": body, "elapsed": 0.1}
+        )
+        assert finding["category"] == "sqli"
+    
+    def test_reflected_payload_skips_xss_patterns(self):
+        """Test a reflected XSS payload is reported without running the pattern scan"""
+        scanner = Scanner()
+        
+        class _NoScan:
+            def search(self, text):
+                raise AssertionError("pattern scan should not run")
+        
+        scanner._xss_re = _NoScan()
+        response = {"status": 200, "headers": {}, "body": "results for <svg onload=alert(1)>", "elapsed": 0.1}
+        
+        finding = scanner.analyze_response({"payload": {"payload": "<svg onload=alert(1)>"}}, response)
+        assert finding["category"] == "xss"
+        assert scanner._body_verdict(response["body"].lower())[1] is None
+    
+    def test_fast_mode_skips_xss_patterns(self):
+        """Test fast mode skips XSS pattern regexes but still checks reflection"""
+        scanner = Scanner(fast=True)
+        
+        response = {"status": 200, "headers": {}, "body": "<svg onload=alert(1)>", "elapsed": 0.1}
+        
+        assert scanner.analyze_response({"payload": {"payload": "plain"}}, response) is None
+        finding = scanner.analyze_response({"payload": {"payload": "<svg onload=alert(1)>"}}, response)
+        assert finding["category"] == "xss"
+        assert Scanner().analyze_response({"payload": {"payload": "plain"}}, response)["category"] == "xss"
+    
+    def test_analyze_response_uppercase_body(self):
+        """Test upper-case responses still match the lowercase patterns"""
+        scanner = Scanner()
+
+        cases = [
+            ("<SCRIPT>alert(1)</SCRIPT>", "xss"),
+            ("<IMG SRC=x ONERROR=alert(1)>", "xss"),
+            ("MySQL Syntax Error near line 1", "sqli"),
+            ("Internal Server Error", "error")
+        ]
+
+        for body, category in cases:
+            response = {"status": 200, "headers": {}, "body": body, "elapsed": 0.1}
+            finding = scanner.analyze_response({"payload": {"payload": "test"}}, response)
+            assert finding is not None
+            assert finding["category"] == category
+
     def test_analyze_response_sqli_detection(self):
         """Test analyze_response with SQL injection detection"""
         scanner = Scanner()
@@ -289,6 +473,42 @@ class TestScanner:
         finding = scanner.analyze_response(test_case, response)
         
         assert finding is None
+    
+    def test_analyze_response_skips_binary_content(self):
+        """Test binary responses are not scanned while text types still are"""
+        scanner = Scanner()
+        
+        test_case = {"payload": {"payload": "' OR 1=1--"}}
+        body = "mysql syntax error"
+        
+        for header in ("Content-Type", "content-type", "Content-type"):
+            for content_type in ("image/png", "application/pdf", "font/woff2"):
+                response = {"status": 200, "headers": {header: content_type}, "body": body, "elapsed": 0.1}
+                assert scanner.analyze_response(test_case, response) is None
+        
+        for content_type in ("text/html; charset=utf-8", "application/problem+json", "APPLICATION/JSON"):
+            response = {"status": 200, "headers": {"content-type": content_type}, "body": body, "elapsed": 0.1}
+            assert scanner.analyze_response(test_case, response)["category"] == "sqli"
+
+    
+    def test_scan_limit(self):
+        """Test only the leading scan_limit characters of a body are scanned"""
+        test_case = {"payload": {"payload": "' OR 1=1--"}}
+        response = {"status": 200, "headers": {}, "body": "a" * 100 + " mysql syntax error", "elapsed": 0.1}
+        
+        assert Scanner(scan_limit=100).analyze_response(test_case, response) is None
+        assert Scanner(scan_limit=None).analyze_response(test_case, response)["category"] == "sqli"
+        assert Scanner().analyze_response(test_case, response)["category"] == "sqli"
+    
+    def test_scan_limit_keeps_reflection(self):
+        """Test payload reflection past scan_limit is still reported"""
+        payload = "<svg onload=alert(1)>"
+        response = {"status": 200, "headers": {}, "body": "a" * 100 + payload, "elapsed": 0.1}
+        
+        finding = Scanner(scan_limit=50).analyze_response({"payload": {"payload": payload}}, response)
+        assert finding["category"] == "xss"
+        assert payload in finding["evidence"]
+        assert Scanner(scan_limit=50).analyze_response({"payload": {"payload": "plain"}}, response) is None
 
 
 if __name__ == "__main__":
@@ -24,7 +24,8 @@ def run_scan(args):
     console.print(f"[green]Concurrency: {args.concurrency}[/green]")
     console.print(f"[green]History enabled: {args.history}[/green]")
     
-    # Run the crawler
+    # Run the crawler; only a crawl failure triggers the sync fallback,
+    # so an error while reporting never re-traverses the site
     try:
         # Try async crawler first
         crawl_results = asyncio.run(crawl(
@@ -33,16 +34,7 @@ def run_scan(args):
             concurrency=args.concurrency,
             delay=0.2
         ))
-        
         console.print("[green]Crawling completed successfully![/green]")
-        console.print(f"[blue]Discovered:[/blue]")
-        console.print(f"  - {len(crawl_results['pages'])} pages")
-        console.print(f"  - {len(crawl_results['forms'])} forms")
-        console.print(f"  - {len(crawl_results['params'])} parameterized URLs")
-        
-        # TODO: Implement actual scanning logic
-        # This will be implemented in subsequent steps
-        console.print("[yellow]Scanning logic will be implemented in the next steps[/yellow]")
         
     except Exception as e:
         console.print(f"[red]Error during crawling: {e}[/red]")
@@ -55,13 +47,17 @@ def run_scan(args):
                 concurrency=args.concurrency,
                 delay=0.2
             )
-            
             console.print("[green]Synchronous crawling completed successfully![/green]")
-            console.print(f"[blue]Discovered:[/blue]")
-            console.print(f"  - {len(crawl_results['pages'])} pages")
-            console.print(f"  - {len(crawl_results['forms'])} forms")
-            console.print(f"  - {len(crawl_results['params'])} parameterized URLs")
             
         except Exception as e2:
             console.print(f"[red]Both async and sync crawling failed: {e2}[/red]")
             return
+    
+    console.print(f"[blue]Discovered:[/blue]")
+    console.print(f"  - {len(crawl_results['pages'])} pages")
+    console.print(f"  - {len(crawl_results['forms'])} forms")
+    console.print(f"  - {len(crawl_results['params'])} parameterized URLs")
+    
+    # TODO: Implement actual scanning logic
+    # This will be implemented in subsequent steps
+    console.print("[yellow]Scanning logic will be implemented in the next steps[/yellow]")